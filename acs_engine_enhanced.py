@@ -22,6 +22,7 @@ try:
         Room,
         Player,
         AdventureGame,
+        NamedBag,
     )
 except ModuleNotFoundError:  # pragma: no cover - interactive launch path fix
     sys.path.insert(0, str(Path(__file__).parent / "src"))
@@ -33,6 +34,7 @@ except ModuleNotFoundError:  # pragma: no cover - interactive launch path fix
         Room,
         Player,
         AdventureGame,
+        NamedBag,
     )
 
 
@@ -141,7 +143,6 @@ class EnhancedMonster(Monster):
     # New fields (all optional)
     dialogue_id: Optional[int] = None
     can_trade: bool = False
-    inventory: List[int] = field(default_factory=list)
     gives_quests: List[int] = field(default_factory=list)
     reaction_level: int = 0  # -100 to +100, affects behavior
     special_abilities: List[str] = field(default_factory=list)
@@ -152,9 +153,15 @@ class EnhancedMonster(Monster):
     drops_items_on_death: List[int] = field(default_factory=list)
 
     @classmethod
-    def from_dict(cls, data: dict):
-        """Create EnhancedMonster from dict"""
+    def from_dict(cls, data: dict, items: Optional[Dict[int, Item]] = None):
+        """Create EnhancedMonster from dict
+
+        The "inventory" ids are looked up in items, so load items first.
+        A trading NPC is a merchant to the base engine's buy and sell.
+        """
         friendliness = MonsterStatus(data.get("friendliness", "neutral"))
+        can_trade = data.get("can_trade", data.get("is_merchant", False))
+        items = items or {}
 
         return cls(
             id=data["id"],
@@ -168,10 +175,15 @@ class EnhancedMonster(Monster):
             weapon_id=data.get("weapon_id"),
             armor_worn=data.get("armor_worn", 0),
             gold=data.get("gold", 0),
+            is_merchant=can_trade,
+            inventory=NamedBag(
+                items[item_id]
+                for item_id in data.get("inventory", ())
+                if item_id in items
+            ),
             # Enhanced fields
             dialogue_id=data.get("dialogue_id"),
-            can_trade=data.get("can_trade", False),
-            inventory=data.get("inventory", []),
+            can_trade=can_trade,
             gives_quests=data.get("gives_quests", []),
             reaction_level=data.get("reaction_level", 0),
             special_abilities=data.get("special_abilities", []),
@@ -428,11 +440,12 @@ class EnhancedAdventureGame(AdventureGame):
     def load_adventure(self):
         """Load adventure with enhanced features"""
         try:
-            with open(self.adventure_file, "r") as f:
-                data = json.load(f)
+            data = self._read_adventure_data()
 
             self.adventure_title = data.get("title", "Untitled Adventure")
             self.adventure_intro = data.get("intro", "")
+            if "seed" in data:
+                self._rng.seed(data["seed"])
 
             # Load enhanced settings if present
             settings = data.get("settings", {})
@@ -450,9 +463,11 @@ class EnhancedAdventureGame(AdventureGame):
 
             # Load monsters (enhanced or original)
             for mon_data in data.get("monsters", []):
-                monster = EnhancedMonster.from_dict(mon_data)
+                monster = EnhancedMonster.from_dict(mon_data, self.items)
                 self.monsters[monster.id] = monster
 
+            self._rebuild_room_index()
+
             # Load puzzles if present
             if "puzzles" in data:
                 self.has_puzzles = True
@@ -489,11 +504,26 @@ class EnhancedAdventureGame(AdventureGame):
             print("Saving is not allowed in this adventure.")
             return False
 
+        # The player holds Item objects; save them as ids
+        player_data = asdict(self.player)
+        player_data["inventory"] = [item.id for item in self.player.inventory]
+        player_data["equipped"] = list(self.player.equipped)
+        for slot_name in ("equipped_weapon", "equipped_armor"):
+            equipped = getattr(self.player, slot_name)
+            player_data[slot_name] = equipped.id if equipped else None
+        # Merchant stock too, as in the adventure file
+        monster_data = {}
+        for monster_id, monster in self.monsters.items():
+            monster_data[monster_id] = asdict(monster)
+            monster_data[monster_id]["inventory"] = [
+                item.id for item in monster.inventory
+            ]
+
         save_data = {
             "adventure_file": self.adventure_file,
-            "player": asdict(self.player),
+            "player": player_data,
             "items": {id: asdict(item) for id, item in self.items.items()},
-            "monsters": {id: asdict(monster) for id, monster in self.monsters.items()},
+            "monsters": monster_data,
             "puzzles": {id: asdict(puzzle) for id, puzzle in self.puzzles.items()},
             "quests": {id: asdict(quest) for id, quest in self.quests.items()},
             "rooms": {id: asdict(room) for id, room in self.rooms.items()},
@@ -5,8 +5,9 @@ The Engine coordinates all game systems, manages the game loop,
 and handles plugin lifecycle.
 """
 
+import bisect
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 from pathlib import Path
 
 from .base_plugin import BasePlugin, PluginPriority
@@ -15,6 +16,12 @@ from .game_state import GameState, GamePhase
 from .services import ServiceRegistry
 
 
+# Event handler priority matching each plugin priority
+_EVENT_PRIORITY = {p: EventPriority(p.value) for p in PluginPriority}
+
+_QUIT_COMMANDS = frozenset({"quit", "exit", "q"})
+
+
 class Engine:
     """
     Main game engine
@@ -40,7 +47,9 @@ class Engine:
         self.services = ServiceRegistry()
 
         self._plugins: Dict[str, BasePlugin] = {}
-        self._plugins_by_priority: List[BasePlugin] = []
+        # (priority, registration order, plugin), kept sorted
+        self._plugins_by_priority: List[Tuple[int, int, BasePlugin]] = []
+        self._plugin_counter = 0
         self._initialized = False
         self._running = False
 
@@ -54,14 +63,19 @@ class Engine:
         name = plugin.metadata.name
 
         if name in self._plugins:
-            self.logger.warning(f"Plugin '{name}' already registered, replacing")
+            self.logger.warning("Plugin '%s' already registered, replacing", name)
+            old = self._plugins[name]
+            self._plugins_by_priority = [
+                entry for entry in self._plugins_by_priority if entry[2] is not old
+            ]
 
         self._plugins[name] = plugin
-        self.logger.info(f"Registered plugin: {name} v{plugin.metadata.version}")
+        self.logger.info("Registered plugin: %s v%s", name, plugin.metadata.version)
 
-        # Rebuild priority list
-        self._plugins_by_priority = sorted(
-            self._plugins.values(), key=lambda p: p.metadata.priority
+        self._plugin_counter += 1
+        bisect.insort(
+            self._plugins_by_priority,
+            (plugin.metadata.priority.value, self._plugin_counter, plugin),
         )
 
     def unregister_plugin(self, plugin_name: str):
@@ -76,8 +90,12 @@ class Engine:
             if plugin.is_initialized:
                 plugin.shutdown()
             del self._plugins[plugin_name]
-            self._plugins_by_priority.remove(plugin)
-            self.logger.info(f"Unregistered plugin: {plugin_name}")
+            self._plugins_by_priority = [
+                entry
+                for entry in self._plugins_by_priority
+                if entry[2] is not plugin
+            ]
+            self.logger.info("Unregistered plugin: %s", plugin_name)
 
     def get_plugin(self, plugin_name: str) -> Optional[BasePlugin]:
         """Get a plugin by name"""
@@ -101,27 +119,29 @@ class Engine:
         self.logger.info("Initializing engine...")
 
         # Initialize plugins in priority order
-        for plugin in self._plugins_by_priority:
+        for _, _, plugin in self._plugins_by_priority:
             try:
-                self.logger.debug(f"Initializing {plugin.metadata.name}...")
+                self.logger.debug("Initializing %s...", plugin.metadata.name)
                 plugin.initialize(self.state, self.event_bus, self.services)
 
                 # Subscribe to events
-                subscriptions = plugin.get_event_subscriptions()
-                for event_name, handler in subscriptions.items():
-                    self.event_bus.subscribe(
-                        event_name=event_name,
-                        handler=handler,
-                        priority=EventPriority(plugin.metadata.priority.value),
-                        plugin_name=plugin.metadata.name,
-                    )
+                priority = _EVENT_PRIORITY[plugin.metadata.priority]
+                name = plugin.metadata.name
+                self.event_bus.subscribe_many(
+                    [
+                        (event_name, handler, priority, name)
+                        for event_name, handler in (
+                            plugin.get_event_subscriptions().items()
+                        )
+                    ]
+                )
 
                 # Enable if configured
                 if plugin.metadata.enabled:
                     plugin.enable()
 
             except Exception as e:
-                self.logger.error(f"Failed to initialize {plugin.metadata.name}: {e}")
+                self.logger.error("Failed to initialize %s: %s", plugin.metadata.name, e)
                 raise
 
         self._initialized = True
@@ -140,7 +160,7 @@ class Engine:
         )
 
         if not event.is_cancelled():
-            self.logger.info(f"Adventure loaded: {adventure_path}")
+            self.logger.info("Adventure loaded: %s", adventure_path)
             self.state.phase = GamePhase.INTRO
 
     def process_command(self, command: str) -> bool:
@@ -159,12 +179,17 @@ class Engine:
 
         return event.data.get("handled", False)
 
-    def run(self):
+    def run(self, input_source: Optional[Iterable[str]] = None):
         """
         Run the main game loop
 
         This is a basic REPL loop. GUI applications should
         integrate differently.
+
+        Args:
+            input_source: Optional iterable of command lines (scripted tests,
+                replays). Commands are read from it without prompting, and
+                the loop ends when it is exhausted.
         """
         if not self._initialized:
             raise RuntimeError("Engine not initialized. Call initialize() first.")
@@ -172,16 +197,24 @@ class Engine:
         self._running = True
         self.event_bus.publish("game.start")
 
+        lines = iter(input_source) if input_source is not None else None
+
         try:
             while self._running and self.state.phase != GamePhase.GAME_OVER:
                 # Get player input
                 try:
-                    command = input("> ").strip()
+                    if lines is None:
+                        command = input("> ").strip()
+                    else:
+                        line = next(lines, None)
+                        if line is None:
+                            break
+                        command = line.strip()
                     if not command:
                         continue
 
                     # Process command
-                    if command.lower() in ["quit", "exit", "q"]:
+                    if command.casefold() in _QUIT_COMMANDS:
                         break
 
                     self.process_command(command)
@@ -211,12 +244,12 @@ class Engine:
         self.event_bus.publish("game.shutdown")
 
         # Shutdown plugins in reverse order
-        for plugin in reversed(self._plugins_by_priority):
+        for _, _, plugin in reversed(self._plugins_by_priority):
             try:
-                self.logger.debug(f"Shutting down {plugin.metadata.name}...")
+                self.logger.debug("Shutting down %s...", plugin.metadata.name)
                 plugin.shutdown()
             except Exception as e:
-                self.logger.error(f"Error shutting down {plugin.metadata.name}: {e}")
+                self.logger.error("Error shutting down %s: %s", plugin.metadata.name, e)
 
         # Shutdown services
         self.services.shutdown_all()
@@ -5,37 +5,64 @@ A Python implementation of classic text adventure game mechanics
 For creating and playing interactive fiction adventures
 """
 
+import hashlib
+import importlib
+import io
 import json
+import marshal
+import os
 import random
+import re
 import sys
+from contextlib import redirect_stdout
+from functools import cached_property
+from operator import itemgetter
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field
 from enum import Enum
 
-# Import enhanced parser if available
-try:
-    from acs.core.parser import NaturalLanguageParser, Companion
-    from acs.systems.npc_context import NPCContextManager
-    from acs.systems.environment import EnvironmentalSystem
-    from acs.tools.commands import SmartCommandSystem
-    from acs.systems.achievements import AchievementSystem
-    from acs.systems.journal import AdventureJournal
-    from acs.systems.tutorial import ContextualHintSystem
-    from acs.tools.modding import ModdingSystem
-    from acs.ui.accessibility import AccessibilitySystem
-
-    ENHANCED_PARSER_AVAILABLE = True
-except ImportError:
-    ENHANCED_PARSER_AVAILABLE = False
-    Companion = None
-    NPCContextManager = None
-    EnvironmentalSystem = None
-    SmartCommandSystem = None
-    AchievementSystem = None
-    AdventureJournal = None
-    ContextualHintSystem = None
-    ModdingSystem = None
-    AccessibilitySystem = None
+
+def _subsystem(module: str, class_name: str, with_engine: bool = False):
+    """Cached property that imports and creates an optional subsystem on first use
+
+    Evaluates to None when the subsystem's module is not available.
+    """
+
+    def load(self):
+        try:
+            cls = getattr(importlib.import_module(module), class_name)
+        except ImportError:
+            return None
+        return cls(engine=self) if with_engine else cls()
+
+    return cached_property(load)
+
+
+# Parsed adventures are cached in the user's cache directory in marshal
+# format, which loads several times faster than re-tokenizing the JSON text
+_CACHE_HEADER = ("acs-adventure", marshal.version, sys.version_info[:2])
+# The IDE rewrites its scratch adventures before every run, so a cache of
+# them would never be read
+_UNCACHED_PREFIX = "_temp_"
+
+
+def adventure_cache_file(adventure_file: str) -> Optional[str]:
+    """Path of the parsed-data cache for adventure_file, or None if uncached"""
+    if os.path.basename(adventure_file).startswith(_UNCACHED_PREFIX):
+        return None
+    base = os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA")
+    if not base:
+        base = os.path.join(os.path.expanduser("~"), ".cache")
+    key = hashlib.sha1(os.path.abspath(adventure_file).encode()).hexdigest()
+    return os.path.join(base, "acs", "adventures", key + ".marshal")
+
+
+def roll_dice(dice: int, sides: int, rng=random) -> int:
+    """Roll dice d sides with rng (a random.Random) and return the total"""
+    if dice == 1:
+        return rng.randint(1, sides)
+    # One C-level call draws every die instead of a randint per die
+    return sum(rng.choices(range(1, sides + 1), k=dice))
 
 
 class ItemType(Enum):
@@ -55,7 +82,257 @@ class MonsterStatus(Enum):
     HOSTILE = "hostile"
 
 
-@dataclass
+# Compass abbreviations accepted wherever a full direction name is an exit
+_DIRECTION_ALIASES = {
+    "n": "north",
+    "s": "south",
+    "e": "east",
+    "w": "west",
+    "u": "up",
+    "d": "down",
+    "ne": "northeast",
+    "nw": "northwest",
+    "se": "southeast",
+    "sw": "southwest",
+}
+
+# Bare movement commands the simple parser accepts, and their directions
+_SIMPLE_DIRECTIONS = {
+    word: direction
+    for direction in ("north", "south", "east", "west", "up", "down")
+    for word in (direction[0], direction)
+}
+
+# Simple-parser verbs and the action handler each one runs; the rest of the
+# command is passed as the action's target
+_SIMPLE_VERBS = {
+    "l": "look",
+    "look": "look",
+    "i": "inventory",
+    "inventory": "inventory",
+    "status": "status",
+    "stats": "status",
+    "party": "party",
+    "recruit": "recruit",
+    "invite": "recruit",
+    "get": "get",
+    "take": "get",
+    "drop": "drop",
+    "attack": "attack",
+    "kill": "attack",
+    "fight": "attack",
+    "quit": "quit",
+    "exit": "quit",
+    "q": "quit",
+    "help": "help",
+    "h": "help",
+    "?": "help",
+    "achievements": "achievements",
+    "journal": "journal",
+    "notes": "journal",
+    "settings": "settings",
+}
+
+# Help for the simple parser, printed in one write
+_SIMPLE_HELP = f"""
+{"=" * 60}
+ADVENTURE COMMANDS
+{"=" * 60}
+
+Movement:
+  n, north, s, south, e, east, w, west, u, up, d, down
+
+Actions:
+  look (l)        - Look around
+  get/take <item> - Pick up an item
+  drop <item>     - Drop an item
+  attack <target> - Attack a monster
+
+Party:
+  party           - View your companions
+  recruit <npc>   - Invite NPC to join party
+
+Info:
+  inventory (i)   - Show what you're carrying
+  status          - Show your character stats
+  help (h, ?)     - Show this help
+
+Other:
+  quit (q)        - Exit the game
+{"=" * 60}
+"""
+
+# Questions the engine can answer; the earliest keyword in the question
+# picks the method that answers it
+_QUESTION_RE = re.compile(
+    r"\b(?:(?P<where>where)\b|(?P<carry>what)\b.*\bcarry|(?P<who>who)\b)",
+    re.IGNORECASE,
+)
+_QUESTION_HANDLERS = {"where": "look", "carry": "show_inventory", "who": "_show_who"}
+
+# "<Verb> what?" replies for handlers shared by several actions
+_WHAT_PROMPTS = {
+    action: f"{action.capitalize()} what?"
+    for action in ("eat", "drink", "open", "close", "equip", "unequip")
+}
+
+# Room feature state left by the open/close actions
+_FEATURE_STATES = {"open": "open", "close": "closed"}
+
+# Suffix shown after a monster's name in room descriptions
+_FRIENDLINESS_LABEL = {
+    MonsterStatus.FRIENDLY: " (friendly)",
+    MonsterStatus.NEUTRAL: "",
+    MonsterStatus.HOSTILE: " (hostile)",
+}
+
+# Headings for the contents listed by look(), indexed by the section number
+# _enumerate_room_contents yields
+_ROOM_SECTION_HEADINGS = ("\nYou notice:", "\nYou see:", "\nPresent:")
+
+# Keywords in a party order mapped to the order they give. Orders other than
+# wait/follow are CompanionStance values.
+_PARTY_ORDER_KEYWORDS = {
+    "wait": "wait",
+    "stay": "wait",
+    "follow": "follow",
+    "come": "follow",
+    "aggressive": "aggressive",
+    "attack": "aggressive",
+    "defensive": "defensive",
+    "defend": "defensive",
+    "support": "support",
+    "help": "support",
+    "passive": "passive",
+    "rest": "passive",
+}
+_STANCE_REPLIES = {
+    "aggressive": "will fight aggressively.",
+    "defensive": "will focus on defense.",
+    "support": "will support the party.",
+    "passive": "will avoid combat.",
+}
+
+# Plain dict lookups skip Enum's value-lookup machinery during loading
+_ITEM_TYPE_MAP = {member.value: member for member in ItemType}
+_MONSTER_STATUS_MAP = {member.value: member for member in MonsterStatus}
+
+
+# Names and queries are compared word by word, ignoring punctuation
+_WORD_RE = re.compile(r"\w+")
+
+
+def _name_words(name_cf: str) -> tuple:
+    """Words of a casefolded name, in order"""
+    return tuple(_WORD_RE.findall(name_cf))
+
+
+def _has_word_run(words: tuple, name_words: tuple) -> bool:
+    """Whether words appear consecutively, as whole words, in name_words"""
+    if len(words) == 1:
+        return words[0] in name_words
+    n = len(words)
+    return any(
+        name_words[i:i + n] == words for i in range(len(name_words) - n + 1)
+    )
+
+
+class NamedBag(list):
+    """List of named game entities that can find members by name
+
+    A name refers to a member if its words run in order through the
+    member's name, or the name starts with it. So "victorian",
+    "gargle blaster" and "rusty sw" find "Crystal (Victorian)",
+    "Pan Galactic Gargle Blaster" and "Rusty Sword", but "a" matches only
+    names beginning with it, not every name containing the letter.
+    Word matches win over prefix matches. A word index makes the usual
+    "get sword" lookup a dict hit.
+    """
+
+    __slots__ = ("_by_token",)
+
+    def __init__(self, iterable=()):
+        super().__init__(iterable)
+        # Built on first find() so copies of non-entities stay cheap
+        self._by_token: Optional[Dict[str, List[Any]]] = None
+
+    def _index(self, obj):
+        for token in set(obj.name_tokens):
+            self._by_token.setdefault(token, []).append(obj)
+
+    def append(self, obj):
+        super().append(obj)
+        if self._by_token is not None:
+            self._index(obj)
+
+    def remove(self, obj):
+        super().remove(obj)
+        if self._by_token is not None:
+            for token in set(obj.name_tokens):
+                self._by_token[token].remove(obj)
+
+    # Any other mutation just drops the index for find() to rebuild
+    def extend(self, iterable):
+        self._by_token = None
+        super().extend(iterable)
+
+    def insert(self, index, obj):
+        self._by_token = None
+        super().insert(index, obj)
+
+    def pop(self, index=-1):
+        self._by_token = None
+        return super().pop(index)
+
+    def clear(self):
+        self._by_token = None
+        super().clear()
+
+    def sort(self, *args, **kwargs):
+        self._by_token = None
+        super().sort(*args, **kwargs)
+
+    def reverse(self):
+        self._by_token = None
+        super().reverse()
+
+    def __setitem__(self, index, value):
+        self._by_token = None
+        super().__setitem__(index, value)
+
+    def __delitem__(self, index):
+        self._by_token = None
+        super().__delitem__(index)
+
+    def __iadd__(self, other):
+        self._by_token = None
+        return super().__iadd__(other)
+
+    def find(self, name: str):
+        """Return the member name refers to, or None
+
+        The first member whose name contains name's words in order wins,
+        otherwise the first whose name starts with it; the same rule as
+        _resolve.
+        """
+        if self._by_token is None:
+            self._by_token = {}
+            for obj in self:
+                self._index(obj)
+        needle = name.casefold()
+        words = _name_words(needle)
+        if words:
+            # Index buckets keep bag order
+            for obj in self._by_token.get(words[0], ()):
+                if _has_word_run(words, obj.name_tokens):
+                    return obj
+        for obj in self:
+            if obj.name_cf.startswith(needle):
+                return obj
+        return None
+
+
+@dataclass(slots=True)
 class Item:
     """Represents an item in the game world"""
 
@@ -74,17 +351,25 @@ class Item:
     is_takeable: bool = True
     is_wearable: bool = False
     location: int = 0  # 0=inventory, -1=worn, room_id or monster_id
+    consumable: bool = False
+    heal_amount: int = 0
+    usable: bool = False
+    equippable: bool = False
+    name_cf: str = field(init=False, repr=False, compare=False)
+    name_tokens: tuple = field(init=False, repr=False, compare=False)
 
-    def get_damage(self) -> int:
+    def __post_init__(self):
+        self.name_cf = self.name.casefold()
+        self.name_tokens = _name_words(self.name_cf)
+
+    def get_damage(self, rng=random) -> int:
         """Calculate weapon damage"""
         if not self.is_weapon:
             return 0
-        return sum(
-            random.randint(1, self.weapon_sides) for _ in range(self.weapon_dice)
-        )
+        return roll_dice(self.weapon_dice, self.weapon_sides, rng)
 
 
-@dataclass
+@dataclass(slots=True)
 class Monster:
     """Represents a monster or NPC"""
 
@@ -99,15 +384,21 @@ class Monster:
     weapon_id: Optional[int] = None
     armor_worn: int = 0
     gold: int = 0
+    is_merchant: bool = False
+    inventory: List[Item] = field(default_factory=NamedBag)
     is_dead: bool = False
     current_health: Optional[int] = None
+    name_cf: str = field(init=False, repr=False, compare=False)
+    name_tokens: tuple = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
+        self.name_cf = self.name.casefold()
+        self.name_tokens = _name_words(self.name_cf)
         if self.current_health is None:
             self.current_health = self.hardiness
 
 
-@dataclass
+@dataclass(slots=True)
 class Room:
     """Represents a room/location"""
 
@@ -116,13 +407,20 @@ class Room:
     description: str
     exits: Dict[str, int] = field(default_factory=dict)  # direction: room_id
     is_dark: bool = False
+    # Openable fixtures: casefolded name -> {"state": "open" or "closed"}
+    features: Dict[str, Dict[str, Any]] = field(default_factory=dict)
 
     def get_exit(self, direction: str) -> Optional[int]:
         """Get room ID for a given direction"""
-        return self.exits.get(direction.lower())
+        # Exit keys are lowercased at load, so the exact key usually hits
+        room_id = self.exits.get(direction)
+        if room_id is None:
+            direction = direction.lower()
+            room_id = self.exits.get(_DIRECTION_ALIASES.get(direction, direction))
+        return room_id
 
 
-@dataclass
+@dataclass(slots=True)
 class Player:
     """Player character stats"""
 
@@ -137,113 +435,237 @@ class Player:
     gold: int = 200
     current_room: int = 1
     current_health: Optional[int] = None
-    inventory: List[int] = field(default_factory=list)  # item IDs
-    equipped_weapon: Optional[int] = None
-    equipped_armor: Optional[int] = None
+    inventory: List[Item] = field(default_factory=NamedBag)
+    equipped_weapon: Optional[Item] = None
+    equipped_armor: Optional[Item] = None
+    equipped: Dict[int, Item] = field(default_factory=dict)  # item id: item
+    quests: List[Any] = field(default_factory=list)
 
     def __post_init__(self):
         if self.current_health is None:
             self.current_health = self.hardiness
 
 
+# Adventure JSON keys in dataclass field order. Records are merged over the
+# defaults once and then read positionally, instead of a .get() per field.
+_ITEM_KEYS = (
+    "id",
+    "name",
+    "description",
+    "type",
+    "weight",
+    "value",
+    "is_weapon",
+    "weapon_type",
+    "weapon_dice",
+    "weapon_sides",
+    "is_armor",
+    "armor_value",
+    "is_takeable",
+    "is_wearable",
+    "location",
+    "consumable",
+    "heal_amount",
+    "usable",
+    "equippable",
+)
+_ITEM_DEFAULTS = {
+    "type": "normal",
+    "weight": 1,
+    "value": 0,
+    "is_weapon": False,
+    "weapon_type": 0,
+    "weapon_dice": 1,
+    "weapon_sides": 6,
+    "is_armor": False,
+    "armor_value": 0,
+    "is_takeable": True,
+    "is_wearable": False,
+    "location": 0,
+    "consumable": False,
+    "heal_amount": 0,
+    "usable": False,
+    "equippable": False,
+}
+_MONSTER_KEYS = (
+    "id",
+    "name",
+    "description",
+    "room_id",
+    "hardiness",
+    "agility",
+    "friendliness",
+    "courage",
+    "weapon_id",
+    "armor_worn",
+    "gold",
+    "is_merchant",
+)
+_MONSTER_DEFAULTS = {
+    "room_id": 1,
+    "hardiness": 10,
+    "agility": 10,
+    "friendliness": "neutral",
+    "courage": 100,
+    "weapon_id": None,
+    "armor_worn": 0,
+    "gold": 0,
+    "is_merchant": False,
+}
+_item_record = itemgetter(*_ITEM_KEYS)
+_monster_record = itemgetter(*_MONSTER_KEYS)
+
+
 class AdventureGame:
     """Main game engine for text adventures"""
 
+    # Enhanced subsystems are imported on first access so that starting the
+    # engine doesn't pay for modules a session may never touch
+    parser = _subsystem("acs.core.parser", "NaturalLanguageParser")
+    npc_context_manager = _subsystem("acs.systems.npc_context", "NPCContextManager")
+    environment = _subsystem("acs.systems.environment", "EnvironmentalSystem")
+    command_system = _subsystem("acs.tools.commands", "SmartCommandSystem")
+    achievements = _subsystem("acs.systems.achievements", "AchievementSystem")
+    journal = _subsystem("acs.systems.journal", "AdventureJournal")
+    tutorial = _subsystem("acs.systems.tutorial", "ContextualHintSystem")
+    modding = _subsystem("acs.tools.modding", "ModdingSystem", with_engine=True)
+    accessibility = _subsystem("acs.ui.accessibility", "AccessibilitySystem")
+
+    @cached_property
+    def use_enhanced_parser(self) -> bool:
+        return self.parser is not None
+
     def __init__(self, adventure_file: str):
         self.adventure_file = adventure_file
         self.rooms: Dict[int, Room] = {}
         self.items: Dict[int, Item] = {}
         self.monsters: Dict[int, Monster] = {}
+        # room_id -> ids present; built lazily, see _rebuild_room_index
+        self._items_by_room: Optional[Dict[int, set]] = None
+        self._monsters_by_room: Optional[Dict[int, set]] = None
+        # room_id -> sorted living monsters, reused until someone moves or dies
+        self._room_monsters: Dict[int, List[Monster]] = {}
+        # room_id -> first merchant there (or None), with the same lifetime
+        self._room_merchant: Dict[int, Optional[Monster]] = {}
         self.player: Player = Player()
-        self.companions: List = []  # Party members
+        self.companions: List = NamedBag()  # Party members
+        self.combat = None  # Active combat encounter, if any
         self.turn_count = 0
         self.game_over = False
         self.adventure_title = ""
         self.adventure_intro = ""
-
-        # Initialize enhanced parser if available
-        if ENHANCED_PARSER_AVAILABLE:
-            self.parser = NaturalLanguageParser()
-            self.npc_context_manager = NPCContextManager()
-            self.environment = EnvironmentalSystem()
-            self.command_system = SmartCommandSystem()
-            self.achievements = AchievementSystem()
-            self.journal = AdventureJournal()
-            self.tutorial = ContextualHintSystem()
-            self.modding = ModdingSystem(engine=self)
-            self.accessibility = AccessibilitySystem()
-            self.use_enhanced_parser = True
-        else:
-            self.parser = None
-            self.npc_context_manager = None
-            self.environment = None
-            self.command_system = None
-            self.achievements = None
-            self.journal = None
-            self.tutorial = None
-            self.modding = None
-            self.accessibility = None
-            self.use_enhanced_parser = False
-
+        # Game randomness; an adventure's "seed" makes playthroughs repeatable
+        self._rng = random.Random()
         self.effects: List[Dict[str, Any]] = []
 
+        # Enhanced parser actions -> handlers, see process_command
+        self._action_table = {
+            "quit": self._action_quit,
+            "help": self._action_help,
+            "move": self._action_move,
+            "look": self._action_look,
+            "get": self._action_get,
+            "drop": self._action_drop,
+            "attack": self._action_attack,
+            "inventory": self._action_inventory,
+            "status": self._action_status,
+            "party": self._action_party,
+            "recruit": self._action_recruit,
+            "party_order": self._action_party_order,
+            "gather": self._action_gather,
+            "eat": self._action_consume,
+            "drink": self._action_consume,
+            "trade": self._action_trade,
+            "buy": self._action_buy,
+            "sell": self._action_sell,
+            "use": self._action_use,
+            "open": self._action_open_close,
+            "close": self._action_open_close,
+            "equip": self._action_equip,
+            "unequip": self._action_equip,
+            "flee": self._action_flee,
+            "give": self._action_give,
+            "quests": self._action_quests,
+            "dismiss": self._action_dismiss,
+            "examine": self._action_examine,
+            "search": self._action_search,
+            "talk": self._action_talk,
+            "question": self._action_question,
+            "achievements": self._action_achievements,
+            "journal": self._action_journal,
+            "settings": self._action_settings,
+        }
+
+    def _read_adventure_data(self) -> Dict[str, Any]:
+        """Read the adventure file, using its binary cache when current"""
+        cache_file = adventure_cache_file(self.adventure_file)
+        if cache_file is None:
+            with open(self.adventure_file, "r") as f:
+                return json.load(f)
+        try:
+            if os.path.getmtime(cache_file) > os.path.getmtime(self.adventure_file):
+                with open(cache_file, "rb") as f:
+                    header, data = marshal.load(f)
+                if header == _CACHE_HEADER:
+                    return data
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+        with open(self.adventure_file, "r") as f:
+            data = json.load(f)
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(cache_file, "wb") as f:
+                marshal.dump((_CACHE_HEADER, data), f)
+        except OSError:
+            pass  # No writable cache directory; just parse the JSON next time
+        return data
+
     def load_adventure(self):
         """Load adventure data from JSON file"""
         try:
-            with open(self.adventure_file, "r") as f:
-                data = json.load(f)
+            data = self._read_adventure_data()
 
             self.adventure_title = data.get("title", "Untitled Adventure")
             self.adventure_intro = data.get("intro", "")
+            if "seed" in data:
+                self._rng.seed(data["seed"])
 
+            # Sections are popped so each raw list can be freed as soon as
+            # it has been converted, rather than living until we return
             # Load rooms
-            for room_data in data.get("rooms", []):
+            for room_data in data.pop("rooms", []):
                 room = Room(
-                    id=room_data["id"],
-                    name=room_data["name"],
-                    description=room_data["description"],
-                    exits=room_data.get("exits", {}),
-                    is_dark=room_data.get("is_dark", False),
+                    room_data["id"],
+                    room_data["name"],
+                    room_data["description"],
+                    {k.lower(): v for k, v in room_data.get("exits", {}).items()},
+                    room_data.get("is_dark", False),
+                    {
+                        name.casefold(): {"state": "closed"}
+                        for name in room_data.get("features", ())
+                    },
                 )
                 self.rooms[room.id] = room
 
             # Load items
-            for item_data in data.get("items", []):
-                item = Item(
-                    id=item_data["id"],
-                    name=item_data["name"],
-                    description=item_data["description"],
-                    item_type=ItemType(item_data.get("type", "normal")),
-                    weight=item_data.get("weight", 1),
-                    value=item_data.get("value", 0),
-                    is_weapon=item_data.get("is_weapon", False),
-                    weapon_type=item_data.get("weapon_type", 0),
-                    weapon_dice=item_data.get("weapon_dice", 1),
-                    weapon_sides=item_data.get("weapon_sides", 6),
-                    is_armor=item_data.get("is_armor", False),
-                    armor_value=item_data.get("armor_value", 0),
-                    is_takeable=item_data.get("is_takeable", True),
-                    location=item_data.get("location", 0),
-                )
+            for item_data in data.pop("items", []):
+                record = {**_ITEM_DEFAULTS, **item_data}
+                record["type"] = _ITEM_TYPE_MAP.get(record["type"], ItemType.NORMAL)
+                item = Item(*_item_record(record))
                 self.items[item.id] = item
 
             # Load monsters
-            for mon_data in data.get("monsters", []):
-                monster = Monster(
-                    id=mon_data["id"],
-                    name=mon_data["name"],
-                    description=mon_data["description"],
-                    room_id=mon_data.get("room_id", 1),
-                    hardiness=mon_data.get("hardiness", 10),
-                    agility=mon_data.get("agility", 10),
-                    friendliness=MonsterStatus(mon_data.get("friendliness", "neutral")),
-                    courage=mon_data.get("courage", 100),
-                    weapon_id=mon_data.get("weapon_id"),
-                    armor_worn=mon_data.get("armor_worn", 0),
-                    gold=mon_data.get("gold", 0),
+            for mon_data in data.pop("monsters", []):
+                record = {**_MONSTER_DEFAULTS, **mon_data}
+                record["friendliness"] = _MONSTER_STATUS_MAP.get(
+                    record["friendliness"], MonsterStatus.NEUTRAL
                 )
+                monster = Monster(*_monster_record(record))
                 self.monsters[monster.id] = monster
 
+            self._rebuild_room_index()
+
             # Load effects (special events)
             self.effects = data.get("effects", [])
 
@@ -268,29 +690,120 @@ class AdventureGame:
         """Get the room the player is currently in"""
         return self.rooms.get(self.player.current_room)
 
+    def _rebuild_room_index(self):
+        """Rebuild the room -> item/monster id indexes from scratch"""
+        self._items_by_room = {}
+        for item in self.items.values():
+            self._items_by_room.setdefault(item.location, set()).add(item.id)
+        self._monsters_by_room = {}
+        self._room_monsters.clear()
+        self._room_merchant.clear()
+        for monster in self.monsters.values():
+            if not monster.is_dead:
+                self._monsters_by_room.setdefault(monster.room_id, set()).add(monster.id)
+
+    def _move_item(self, item: Item, location: int):
+        """Change an item's location, keeping the room index current"""
+        if self._items_by_room is not None:
+            self._items_by_room.get(item.location, set()).discard(item.id)
+            self._items_by_room.setdefault(location, set()).add(item.id)
+        item.location = location
+
+    def _move_monster(self, monster: Monster, room_id: int):
+        """Change a monster's room, keeping the room index current"""
+        if self._monsters_by_room is not None:
+            self._monsters_by_room.get(monster.room_id, set()).discard(monster.id)
+            self._monsters_by_room.setdefault(room_id, set()).add(monster.id)
+        for cache in (self._room_monsters, self._room_merchant):
+            cache.pop(monster.room_id, None)
+            cache.pop(room_id, None)
+        monster.room_id = room_id
+
+    def _kill_monster(self, monster: Monster):
+        """Mark a monster dead and drop it from the room index"""
+        monster.is_dead = True
+        if self._monsters_by_room is not None:
+            self._monsters_by_room.get(monster.room_id, set()).discard(monster.id)
+        self._room_monsters.pop(monster.room_id, None)
+        self._room_merchant.pop(monster.room_id, None)
+
+    @staticmethod
+    def _resolve(name: str, candidates):
+        """Return the candidate name refers to, or None
+
+        Same rule as NamedBag.find: the first candidate whose name contains
+        name's words in order, otherwise the first whose name starts with it.
+        """
+        needle = name.casefold()
+        words = _name_words(needle)
+        prefix_match = None
+        for candidate in candidates:
+            if words and _has_word_run(words, candidate.name_tokens):
+                return candidate
+            if prefix_match is None and candidate.name_cf.startswith(needle):
+                prefix_match = candidate
+        return prefix_match
+
     def get_items_in_room(self, room_id: int) -> List[Item]:
         """Get all items in a specific room"""
-        return [item for item in self.items.values() if item.location == room_id]
+        if self._items_by_room is None:
+            self._rebuild_room_index()
+        return [self.items[i] for i in sorted(self._items_by_room.get(room_id, ()))]
 
     def get_monsters_in_room(self, room_id: int) -> List[Monster]:
-        """Get all living monsters in a specific room"""
-        return [
-            m for m in self.monsters.values() if m.room_id == room_id and not m.is_dead
-        ]
+        """Get all living monsters in a specific room
+
+        The list is cached until a monster enters, leaves or dies in the
+        room, so callers must not modify it.
+        """
+        monsters = self._room_monsters.get(room_id)
+        if monsters is None:
+            # Dead monsters are never indexed, see _kill_monster
+            if self._monsters_by_room is None:
+                self._rebuild_room_index()
+            monsters = self._room_monsters[room_id] = [
+                self.monsters[i] for i in sorted(self._monsters_by_room.get(room_id, ()))
+            ]
+        return monsters
+
+    def get_merchant_in_room(self, room_id: int) -> Optional[Monster]:
+        """Get the first living merchant in a room, or None"""
+        try:
+            return self._room_merchant[room_id]
+        except KeyError:
+            merchant = next(
+                (m for m in self.get_monsters_in_room(room_id) if m.is_merchant), None
+            )
+            self._room_merchant[room_id] = merchant
+            return merchant
+
+    def _enumerate_room_contents(self, room_id: int):
+        """Yield (section, text) for everything listed in a room, in display order
+
+        Sections are 0 for inspectable objects, 1 for items, 2 for monsters.
+        """
+        if self.environment:
+            for obj in self.environment.get_room_objects(room_id):
+                yield 0, obj.short_desc
+        if self._items_by_room is None:
+            self._rebuild_room_index()
+        for item_id in sorted(self._items_by_room.get(room_id, ())):
+            yield 1, self.items[item_id].name
+        for monster in self.get_monsters_in_room(room_id):
+            yield 2, f"{monster.name}{_FRIENDLINESS_LABEL[monster.friendliness]}"
 
     def look(self):
         """Display current room description"""
         room = self.get_current_room()
-        print(f"\n{room.name}")
-        print("-" * len(room.name))
-        print(room.description)
+        # Collected and written once instead of a print() per line
+        out = [f"\n{room.name}", "-" * len(room.name), room.description]
 
         # Show exits
         if room.exits:
             exits = ", ".join(room.exits.keys())
-            print(f"\nObvious exits: {exits}")
+            out.append(f"\nObvious exits: {exits}")
         else:
-            print("\nNo obvious exits.")
+            out.append("\nNo obvious exits.")
 
         # Environmental details (time/weather)
         if self.environment:
@@ -300,43 +813,24 @@ class AdventureGame:
 
             # Show environmental atmosphere occasionally
             if room_state.visited_count == 1:
-                print(f"\n{self.environment.get_time_description()}")
-                print(self.environment.get_weather_description())
+                out.append(f"\n{self.environment.get_time_description()}")
+                out.append(self.environment.get_weather_description())
 
             # Show ambient message occasionally
             ambient = self.environment.get_ambient_message(room.id)
             if ambient:
-                print(f"\n{ambient}")
-
-            # Show inspectable objects
-            objects = self.environment.get_room_objects(room.id)
-            if objects:
-                print("\nYou notice:")
-                for obj in objects:
-                    print(f"  - {obj.short_desc}")
-
-        # Show items
-        items = self.get_items_in_room(room.id)
-        if items:
-            print("\nYou see:")
-            for item in items:
-                print(f"  - {item.name}")
-
-        # Show monsters
-        monsters = self.get_monsters_in_room(room.id)
-        if monsters:
-            print("\nPresent:")
-            for monster in monsters:
-                status = (
-                    "friendly"
-                    if monster.friendliness == MonsterStatus.FRIENDLY
-                    else (
-                        "hostile"
-                        if monster.friendliness == MonsterStatus.HOSTILE
-                        else ""
-                    )
-                )
-                print(f"  - {monster.name} {f'({status})' if status else ''}")
+                out.append(f"\n{ambient}")
+
+        # Objects, items and monsters in one pass, then by section
+        sections = ([], [], [])
+        for section, line in self._enumerate_room_contents(room.id):
+            sections[section].append(f"  - {line}")
+        for heading, lines in zip(_ROOM_SECTION_HEADINGS, sections):
+            if lines:
+                out.append(heading)
+                out.extend(lines)
+
+        sys.stdout.write("\n".join(out) + "\n")
 
     def move(self, direction: str):
         """Move player in a direction"""
@@ -373,7 +867,9 @@ class AdventureGame:
 
         # Show tutorial hint
         if self.tutorial:
-            stats = self.achievements.statistics.to_dict() if self.achievements else {}
+            # Hint triggers only read counters, so pass the live attribute
+            # dict instead of serializing the statistics every move
+            stats = vars(self.achievements.statistics) if self.achievements else {}
             hint = self.tutorial.check_and_show_hint("moved", stats)
             if hint:
                 print(self.tutorial._format_tutorial(hint))
@@ -381,14 +877,7 @@ class AdventureGame:
     def get_item(self, item_name: str):
         """Pick up an item"""
         room = self.get_current_room()
-        items = self.get_items_in_room(room.id)
-
-        # Find matching item
-        item = None
-        for i in items:
-            if item_name.lower() in i.name.lower():
-                item = i
-                break
+        item = self._resolve(item_name, self.get_items_in_room(room.id))
 
         if item is None:
             print(f"You don't see a {item_name} here.")
@@ -398,25 +887,20 @@ class AdventureGame:
             print(f"You can't take the {item.name}.")
             return
 
-        item.location = 0  # Move to inventory
-        self.player.inventory.append(item.id)
+        self._move_item(item, 0)  # Move to inventory
+        self.player.inventory.append(item)
         print(f"You take the {item.name}.")
 
     def drop_item(self, item_name: str):
         """Drop an item"""
-        item = None
-        for item_id in self.player.inventory:
-            i = self.items[item_id]
-            if item_name.lower() in i.name.lower():
-                item = i
-                break
+        item = self.player.inventory.find(item_name)
 
         if item is None:
             print(f"You don't have a {item_name}.")
             return
 
-        item.location = self.player.current_room
-        self.player.inventory.remove(item.id)
+        self._move_item(item, self.player.current_room)
+        self.player.inventory.remove(item)
         print(f"You drop the {item.name}.")
 
     def show_inventory(self):
@@ -425,48 +909,43 @@ class AdventureGame:
             print("\nYou are empty-handed.")
             return
 
-        print("\nYou are carrying:")
+        out = ["\nYou are carrying:"]
         total_weight = 0
-        for item_id in self.player.inventory:
-            item = self.items[item_id]
+        for item in self.player.inventory:
             equipped = ""
-            if item.id == self.player.equipped_weapon:
+            if item is self.player.equipped_weapon:
                 equipped = " (weapon)"
-            elif item.id == self.player.equipped_armor:
+            elif item is self.player.equipped_armor:
                 equipped = " (armor)"
-            print(f"  - {item.name}{equipped}")
+            out.append(f"  - {item.name}{equipped}")
             total_weight += item.weight
 
-        print(f"\nTotal weight: {total_weight}")
-        print(f"Gold: {self.player.gold}")
+        out.append(f"\nTotal weight: {total_weight}")
+        out.append(f"Gold: {self.player.gold}")
+        sys.stdout.write("\n".join(out) + "\n")
 
     def show_status(self):
         """Display player status"""
-        print(f"\n{self.player.name}")
-        print("-" * 40)
-        print(f"Health: {self.player.current_health}/{self.player.hardiness}")
-        print(f"Hardiness: {self.player.hardiness}")
-        print(f"Agility: {self.player.agility}")
-        print(f"Charisma: {self.player.charisma}")
-        print(f"Gold: {self.player.gold}")
+        out = [
+            f"\n{self.player.name}",
+            "-" * 40,
+            f"Health: {self.player.current_health}/{self.player.hardiness}",
+            f"Hardiness: {self.player.hardiness}",
+            f"Agility: {self.player.agility}",
+            f"Charisma: {self.player.charisma}",
+            f"Gold: {self.player.gold}",
+        ]
 
         if self.player.equipped_weapon:
-            weapon = self.items[self.player.equipped_weapon]
-            print(f"Weapon: {weapon.name}")
+            out.append(f"Weapon: {self.player.equipped_weapon.name}")
         if self.player.equipped_armor:
-            armor = self.items[self.player.equipped_armor]
-            print(f"Armor: {armor.name}")
+            out.append(f"Armor: {self.player.equipped_armor.name}")
+        sys.stdout.write("\n".join(out) + "\n")
 
     def attack(self, target_name: str):
         """Attack a monster"""
         room = self.get_current_room()
-        monsters = self.get_monsters_in_room(room.id)
-
-        target = None
-        for m in monsters:
-            if target_name.lower() in m.name.lower():
-                target = m
-                break
+        target = self._resolve(target_name, self.get_monsters_in_room(room.id))
 
         if target is None:
             print(f"You don't see a {target_name} here.")
@@ -478,17 +957,16 @@ class AdventureGame:
         # Player attacks
         damage = 0
         if self.player.equipped_weapon:
-            weapon = self.items[self.player.equipped_weapon]
-            damage = weapon.get_damage()
+            damage = self.player.equipped_weapon.get_damage(self._rng)
         else:
-            damage = random.randint(1, 3)  # Bare hands
+            damage = roll_dice(1, 3, self._rng)  # Bare hands
 
         print(f"\nYou attack the {target.name}!")
         target.current_health -= damage
         print(f"You hit for {damage} damage!")
 
         if target.current_health <= 0:
-            target.is_dead = True
+            self._kill_monster(target)
             print(f"The {target.name} is dead!")
             if target.gold > 0:
                 self.player.gold += target.gold
@@ -496,7 +974,7 @@ class AdventureGame:
             return
 
         # Monster counter-attacks
-        mon_damage = random.randint(1, 6)
+        mon_damage = roll_dice(1, 6, self._rng)
         self.player.current_health -= mon_damage
         print(f"The {target.name} hits you for {mon_damage} damage!")
 
@@ -508,14 +986,7 @@ class AdventureGame:
     def talk_to_npc(self, npc_name: str, topic: str = None):
         """Enhanced NPC interaction with memory and emotions"""
         room = self.get_current_room()
-        monsters = self.get_monsters_in_room(room.id)
-
-        # Find the NPC
-        npc = None
-        for m in monsters:
-            if npc_name.lower() in m.name.lower():
-                npc = m
-                break
+        npc = self._resolve(npc_name, self.get_monsters_in_room(room.id))
 
         if npc is None:
             print(f"You don't see {npc_name} here.")
@@ -561,13 +1032,7 @@ class AdventureGame:
     def examine_npc(self, npc_name: str):
         """Examine an NPC to learn about them"""
         room = self.get_current_room()
-        monsters = self.get_monsters_in_room(room.id)
-
-        npc = None
-        for m in monsters:
-            if npc_name.lower() in m.name.lower():
-                npc = m
-                break
+        npc = self._resolve(npc_name, self.get_monsters_in_room(room.id))
 
         if npc is None:
             print(f"You don't see {npc_name} here.")
@@ -604,7 +1069,7 @@ class AdventureGame:
                 item = self.items.get(obj.contains_item_id)
                 if item:
                     print(f"\nYou found: {item.name}!")
-                    item.location = room.id
+                    self._move_item(item, room.id)
         else:
             print(f"You don't see anything special about {object_name}.")
 
@@ -627,19 +1092,12 @@ class AdventureGame:
     # Party/Companion Management Methods
     def recruit_companion(self, npc_name: str):
         """Recruit an NPC as a companion"""
-        if not ENHANCED_PARSER_AVAILABLE:
+        if self.parser is None:
             print("Companion system not available.")
             return
 
         room = self.get_current_room()
-        monsters = self.get_monsters_in_room(room.id)
-
-        # Find NPC
-        npc = None
-        for m in monsters:
-            if npc_name.lower() in m.name.lower():
-                npc = m
-                break
+        npc = self._resolve(npc_name, self.get_monsters_in_room(room.id))
 
         if not npc:
             print(f"You don't see {npc_name} here.")
@@ -661,13 +1119,15 @@ class AdventureGame:
             role = "rogue"
 
         # Create companion
+        from acs.core.parser import Companion
+
         companion = Companion(npc.id, npc.name, role)
         companion.current_health = npc.current_health
         companion.max_health = npc.hardiness
 
         self.companions.append(companion)
         print(f"\n{npc.name} joins your party as a {role}!")
-        npc.room_id = -999
+        self._move_monster(npc, -999)
 
     def show_party(self):
         """Display party status"""
@@ -675,79 +1135,62 @@ class AdventureGame:
             print("\nYou are traveling alone.")
             return
 
-        print("\n" + "=" * 50)
-        print("YOUR PARTY")
-        print("=" * 50)
+        out = ["\n" + "=" * 50, "YOUR PARTY", "=" * 50]
         for companion in self.companions:
             alive = "ALIVE" if companion.is_alive() else "DEAD"
             status_info = ""
-            if hasattr(companion, "is_waiting") and companion.is_waiting:
+            if companion.is_waiting:
                 status_info = " (WAITING)"
-            print(f"\n{companion.name} - {companion.role} " f"({alive}){status_info}")
-            print(f"  HP: {companion.current_health}/{companion.max_health}")
-            print(f"  Loyalty: {companion.loyalty}/100")
-            if hasattr(companion, "stance"):
-                print(f"  Stance: {companion.stance.value}")
-        print("=" * 50)
+            out.append(f"\n{companion.name} - {companion.role} " f"({alive}){status_info}")
+            out.append(f"  HP: {companion.current_health}/{companion.max_health}")
+            out.append(f"  Loyalty: {companion.loyalty}/100")
+            out.append(f"  Stance: {companion.stance.value}")
+        out.append("=" * 50)
+        sys.stdout.write("\n".join(out) + "\n")
 
     def party_command(self, companion_name: str, order: str):
         """Give orders to a specific companion"""
-        if not ENHANCED_PARSER_AVAILABLE:
+        if self.parser is None:
             print("Party commands not available.")
             return
 
-        # Find companion
-        companion = None
-        for c in self.companions:
-            if companion_name.lower() in c.name.lower():
-                companion = c
-                break
-
+        companion = self.companions.find(companion_name)
         if not companion:
             print(f"{companion_name} is not in your party.")
             return
 
         order = order.lower().strip()
 
-        # Handle different orders
-        if "wait" in order or "stay" in order:
+        # The first recognised keyword decides the order
+        action = None
+        for word in order.split():
+            action = _PARTY_ORDER_KEYWORDS.get(word.strip(".,!?"))
+            if action:
+                break
+
+        if action == "wait":
             companion.tell_to_wait(self.player.current_room)
             print(f"{companion.name} will wait here.")
-        elif "follow" in order or "come" in order:
+        elif action == "follow":
             companion.tell_to_follow()
             print(f"{companion.name} resumes following you.")
-        elif "aggressive" in order or "attack" in order:
-            from acs_parser import CompanionStance
-
-            companion.set_stance(CompanionStance.AGGRESSIVE)
-            print(f"{companion.name} will fight aggressively.")
-        elif "defensive" in order or "defend" in order:
-            from acs_parser import CompanionStance
-
-            companion.set_stance(CompanionStance.DEFENSIVE)
-            print(f"{companion.name} will focus on defense.")
-        elif "support" in order or "help" in order:
-            from acs_parser import CompanionStance
-
-            companion.set_stance(CompanionStance.SUPPORT)
-            print(f"{companion.name} will support the party.")
-        elif "passive" in order or "rest" in order:
-            from acs_parser import CompanionStance
-
-            companion.set_stance(CompanionStance.PASSIVE)
-            print(f"{companion.name} will avoid combat.")
+        elif action:
+            from acs.core.parser import CompanionStance
+
+            companion.set_stance(CompanionStance(action))
+            print(f"{companion.name} {_STANCE_REPLIES[action]}")
         else:
             print(f"You tell {companion.name}: {order}")
             print(f"{companion.name} nods in understanding.")
 
     def gather_party(self):
         """Bring all waiting companions to current location"""
-        if not ENHANCED_PARSER_AVAILABLE:
+        if self.parser is None:
             return
 
         gathered = []
         for companion in self.companions:
-            if hasattr(companion, "is_waiting") and companion.is_waiting:
+            if companion.is_waiting:
                 companion.tell_to_follow()
                 gathered.append(companion.name)
 
@@ -757,530 +1200,482 @@ class AdventureGame:
         else:
             print("All companions are already following you.")
 
-    def process_command(self, command: str):
-        """Process a player command"""
-        # Process with smart command system if available
-        if self.command_system:
-            # Fix typos and process
-            command = self.command_system.process_input(command)
-            # Add to history
-            self.command_system.add_to_history(command)
+    @staticmethod
+    def _target(parsed: Dict[str, Any]) -> str:
+        """The object of a parsed command, or an empty string"""
+        return parsed.get("target") or parsed.get("object", "")
+
+    def _action_quit(self, parsed: Dict[str, Any]):
+        """Handle the quit action"""
+        print("\nThanks for playing!")
+        self.game_over = True
+
+    def _action_help(self, parsed: Dict[str, Any]):
+        """Handle the help action"""
+        self.show_help()
+
+    def _action_move(self, parsed: Dict[str, Any]):
+        """Handle the move action"""
+        self.move(parsed.get("direction", ""))
+
+    def _action_look(self, parsed: Dict[str, Any]):
+        """Handle the look action"""
+        if parsed.get("target"):
+            print(f"You examine the {parsed['target']}...")
+            # Could add detailed examine here
+        else:
+            self.look()
 
-        # Try enhanced parser first
-        if self.use_enhanced_parser and self.parser:
-            parsed = self.parser.parse_command(command)
-            action = parsed.get("action")
+    def _action_get(self, parsed: Dict[str, Any]):
+        """Handle the get action"""
+        target = self._target(parsed)
+        if target:
+            self.get_item(target)
+        else:
+            print("Get what?")
 
-            if action == "quit":
-                print("\nThanks for playing!")
-                self.game_over = True
-                return
-            elif action == "help":
-                self.show_help()
-                return
-            elif action == "move":
-                self.move(parsed.get("direction", ""))
-                return
-            elif action == "look":
-                if parsed.get("target"):
-                    print(f"You examine the {parsed['target']}...")
-                    # Could add detailed examine here
-                else:
-                    self.look()
-                return
-            elif action == "get":
-                target = parsed.get("target", parsed.get("object", ""))
-                if target:
-                    self.get_item(target)
-                else:
-                    print("Get what?")
-                return
-            elif action == "drop":
-                target = parsed.get("target", parsed.get("object", ""))
-                if target:
-                    self.drop_item(target)
-                else:
-                    print("Drop what?")
-                return
-            elif action == "attack":
-                target = parsed.get("target", "")
-                if target:
-                    self.attack(target)
-                else:
-                    print("Attack what?")
-                return
-            elif action == "inventory":
-                self.show_inventory()
-                return
-            elif action == "status":
-                self.show_status()
-                return
-            elif action == "party":
-                self.show_party()
-                return
-            elif action == "recruit":
-                target = parsed.get("target", "")
-                if target:
-                    self.recruit_companion(target)
-                else:
-                    print("Recruit who?")
-                return
-            elif action == "party_order":
-                companion = parsed.get("companion", "")
-                order = parsed.get("order", "")
-                if companion and order:
-                    self.party_command(companion, order)
-                else:
-                    print("Tell who to do what?")
-                return
-            elif action == "gather":
-                self.gather_party()
-                return
-            elif action == "eat" or action == "drink":
-                target = parsed.get("target", "")
-                if target:
-                    # Try to find the item in inventory
-                    item = None
-                    for i in self.player.inventory:
-                        if target.lower() in i.name.lower():
-                            item = i
-                            break
+    def _action_drop(self, parsed: Dict[str, Any]):
+        """Handle the drop action"""
+        target = self._target(parsed)
+        if target:
+            self.drop_item(target)
+        else:
+            print("Drop what?")
 
-                    if item:
-                        # Check if it's consumable
-                        consumable = hasattr(item, "consumable") and item.consumable
-                        if consumable:
-                            print(f"You {action} the {item.name}.")
-                            # Apply any effects (healing, etc)
-                            if hasattr(item, "heal_amount") and item.heal_amount > 0:
-                                old_health = self.player.health
-                                new_health = min(
-                                    self.player.max_health,
-                                    old_health + item.heal_amount,
-                                )
-                                self.player.health = new_health
-                                heal_msg = (
-                                    f"You feel refreshed! "
-                                    f"Health restored by "
-                                    f"{item.heal_amount}."
-                                )
-                                print(heal_msg)
-                            self.player.inventory.remove(item)
-                        else:
-                            print(f"You can't {action} that.")
-                    else:
-                        print(f"You don't have any {target}.")
-                else:
-                    print(f"{action.capitalize()} what?")
-                return
-            elif action == "trade":
-                target = parsed.get("target", "")
-                if target:
-                    # Find NPC to trade with
-                    room = self.get_current_room()
-                    monsters = self.get_monsters_in_room(room.id)
-                    npc = None
-                    for m in monsters:
-                        if target.lower() in m.name.lower():
-                            npc = m
-                            break
-
-                    if npc:
-                        # Check if NPC is a merchant
-                        is_merchant = hasattr(npc, "is_merchant") and npc.is_merchant
-                        if is_merchant:
-                            print(f"You begin trading with {npc.name}.")
-                            # Show merchant inventory if available
-                            if hasattr(npc, "inventory") and npc.inventory:
-                                print("\nAvailable items:")
-                                for item in npc.inventory:
-                                    price = item.value if hasattr(item, "value") else 10
-                                    print(f"  - {item.name} ({price} gold)")
-                                print("\nUse 'buy [item]' or 'sell [item]'")
-                            else:
-                                print(f"{npc.name} has nothing to trade.")
-                        else:
-                            print(f"{npc.name} doesn't want to trade.")
-                    else:
-                        print(f"You don't see any {target} here.")
+    def _action_attack(self, parsed: Dict[str, Any]):
+        """Handle the attack action"""
+        target = self._target(parsed)
+        if target:
+            self.attack(target)
+        else:
+            print("Attack what?")
+
+    def _action_inventory(self, parsed: Dict[str, Any]):
+        """Handle the inventory action"""
+        self.show_inventory()
+
+    def _action_status(self, parsed: Dict[str, Any]):
+        """Handle the status action"""
+        self.show_status()
+
+    def _action_party(self, parsed: Dict[str, Any]):
+        """Handle the party action"""
+        self.show_party()
+
+    def _action_recruit(self, parsed: Dict[str, Any]):
+        """Handle the recruit action"""
+        target = self._target(parsed)
+        if target:
+            self.recruit_companion(target)
+        else:
+            print("Recruit who?")
+
+    def _action_party_order(self, parsed: Dict[str, Any]):
+        """Handle the party_order action"""
+        companion = parsed.get("companion", "")
+        order = parsed.get("order", "")
+        if companion and order:
+            self.party_command(companion, order)
+        else:
+            print("Tell who to do what?")
+
+    def _action_gather(self, parsed: Dict[str, Any]):
+        """Handle the gather action"""
+        self.gather_party()
+
+    def _action_consume(self, parsed: Dict[str, Any]):
+        """Handle the eat/drink action"""
+        action = parsed["action"]
+        target = self._target(parsed)
+        if target:
+            # Try to find the item in inventory
+            item = self.player.inventory.find(target)
+
+            if item:
+                # Check if it's consumable
+                if item.consumable:
+                    print(f"You {action} the {item.name}.")
+                    # Apply any effects (healing, etc)
+                    if item.heal_amount > 0:
+                        self.player.current_health = min(
+                            self.player.hardiness,
+                            self.player.current_health + item.heal_amount,
+                        )
+                        heal_msg = (
+                            f"You feel refreshed! "
+                            f"Health restored by "
+                            f"{item.heal_amount}."
+                        )
+                        print(heal_msg)
+                    self.player.inventory.remove(item)
                 else:
-                    print("Trade with whom?")
-                return
-            elif action == "buy":
-                target = parsed.get("target", "")
-                if target:
-                    # Find merchant NPC in current room
-                    room = self.get_current_room()
-                    monsters = self.get_monsters_in_room(room.id)
-                    merchant = None
-                    for m in monsters:
-                        is_merch = hasattr(m, "is_merchant") and m.is_merchant
-                        if is_merch:
-                            merchant = m
-                            break
-
-                    if merchant:
-                        # Find item in merchant's inventory
-                        item = None
-                        if hasattr(merchant, "inventory"):
-                            for i in merchant.inventory:
-                                if target.lower() in i.name.lower():
-                                    item = i
-                                    break
-
-                        if item:
-                            price = item.value if hasattr(item, "value") else 10
-                            player_gold = (
-                                self.player.gold if hasattr(self.player, "gold") else 0
-                            )
-                            if player_gold >= price:
-                                self.player.gold -= price
-                                self.player.inventory.append(item)
-                                merchant.inventory.remove(item)
-                                print(f"You bought {item.name} for " f"{price} gold.")
-                            else:
-                                print(f"You need {price} gold to buy that.")
-                        else:
-                            print(f"The merchant doesn't have any {target}.")
+                    print(f"You can't {action} that.")
+            else:
+                print(f"You don't have any {target}.")
+        else:
+            print(_WHAT_PROMPTS[action])
+
+    def _action_trade(self, parsed: Dict[str, Any]):
+        """Handle the trade action"""
+        target = self._target(parsed)
+        if target:
+            # Find NPC to trade with
+            room = self.get_current_room()
+            npc = self._resolve(target, self.get_monsters_in_room(room.id))
+
+            if npc:
+                if npc.is_merchant:
+                    print(f"You begin trading with {npc.name}.")
+                    # Show merchant inventory if available
+                    if npc.inventory:
+                        print("\nAvailable items:")
+                        for item in npc.inventory:
+                            print(f"  - {item.name} ({item.value} gold)")
+                        print("\nUse 'buy [item]' or 'sell [item]'")
                     else:
-                        print("There's no merchant here.")
+                        print(f"{npc.name} has nothing to trade.")
                 else:
-                    print("Buy what?")
-                return
-            elif action == "sell":
-                target = parsed.get("target", "")
-                if target:
-                    # Find merchant NPC in current room
-                    room = self.get_current_room()
-                    monsters = self.get_monsters_in_room(room.id)
-                    merchant = None
-                    for m in monsters:
-                        is_merch = hasattr(m, "is_merchant") and m.is_merchant
-                        if is_merch:
-                            merchant = m
-                            break
-
-                    if merchant:
-                        # Find item in player's inventory
-                        item = None
-                        for i in self.player.inventory:
-                            if target.lower() in i.name.lower():
-                                item = i
-                                break
-
-                        if item:
-                            price = item.value if hasattr(item, "value") else 5
-                            sell_price = price // 2
-                            if not hasattr(self.player, "gold"):
-                                self.player.gold = 0
-                            self.player.gold += sell_price
-                            self.player.inventory.remove(item)
-                            if hasattr(merchant, "inventory"):
-                                merchant.inventory.append(item)
-                            print(f"You sold {item.name} for " f"{sell_price} gold.")
-                        else:
-                            print(f"You don't have any {target}.")
+                    print(f"{npc.name} doesn't want to trade.")
+            else:
+                print(f"You don't see any {target} here.")
+        else:
+            print("Trade with whom?")
+
+    def _action_buy(self, parsed: Dict[str, Any]):
+        """Handle the buy action"""
+        target = self._target(parsed)
+        if target:
+            merchant = self.get_merchant_in_room(self.player.current_room)
+
+            if merchant:
+                # Find item in merchant's inventory
+                item = merchant.inventory.find(target)
+
+                if item:
+                    price = item.value
+                    if self.player.gold >= price:
+                        self.player.gold -= price
+                        self.player.inventory.append(item)
+                        merchant.inventory.remove(item)
+                        print(f"You bought {item.name} for " f"{price} gold.")
                     else:
-                        print("There's no merchant here.")
+                        print(f"You need {price} gold to buy that.")
                 else:
-                    print("Sell what?")
-                return
-            elif action == "use":
-                target = parsed.get("target", "")
-                if target:
-                    # Find item in inventory
-                    item = None
-                    for i in self.player.inventory:
-                        if target.lower() in i.name.lower():
-                            item = i
-                            break
+                    print(f"The merchant doesn't have any {target}.")
+            else:
+                print("There's no merchant here.")
+        else:
+            print("Buy what?")
 
-                    if item:
-                        # Check for usable attribute
-                        if hasattr(item, "usable") and item.usable:
-                            print(f"You use the {item.name}.")
-                            # Apply effects if any
-                            if hasattr(item, "on_use"):
-                                item.on_use(self.player, self)
-                        else:
-                            print(f"You can't use the {item.name}.")
-                    else:
-                        print(f"You don't have any {target}.")
+    def _action_sell(self, parsed: Dict[str, Any]):
+        """Handle the sell action"""
+        target = self._target(parsed)
+        if target:
+            merchant = self.get_merchant_in_room(self.player.current_room)
+
+            if merchant:
+                # Find item in player's inventory
+                item = self.player.inventory.find(target)
+
+                if item:
+                    sell_price = item.value // 2
+                    self.player.gold += sell_price
+                    self.player.inventory.remove(item)
+                    merchant.inventory.append(item)
+                    print(f"You sold {item.name} for " f"{sell_price} gold.")
                 else:
-                    print("Use what?")
-                return
-            elif action == "open" or action == "close":
-                target = parsed.get("target", "")
-                if target:
-                    room = self.get_current_room()
-                    # Check if target is in room
-                    found = False
-                    if hasattr(room, "features"):
-                        for feature in room.features:
-                            if target.lower() in feature.lower():
-                                found = True
-                                print(f"You {action} the {target}.")
-                                # Could store state changes here
-                                break
-
-                    if not found:
-                        print(f"You don't see any {target} to {action}.")
+                    print(f"You don't have any {target}.")
+            else:
+                print("There's no merchant here.")
+        else:
+            print("Sell what?")
+
+    def _action_use(self, parsed: Dict[str, Any]):
+        """Handle the use action"""
+        target = self._target(parsed)
+        if target:
+            # Find item in inventory
+            item = self.player.inventory.find(target)
+
+            if item:
+                if item.usable:
+                    print(f"You use the {item.name}.")
                 else:
-                    print(f"{action.capitalize()} what?")
-                return
-            elif action == "equip" or action == "unequip":
-                target = parsed.get("target", "")
-                if target:
-                    item = None
-                    if action == "equip":
-                        # Find in inventory
-                        for i in self.player.inventory:
-                            if target.lower() in i.name.lower():
-                                item = i
-                                break
-
-                        if item:
-                            equippable = hasattr(item, "equippable") and item.equippable
-                            if equippable:
-                                # Add to equipped set
-                                if not hasattr(self.player, "equipped"):
-                                    self.player.equipped = set()
-                                self.player.equipped.add(item)
-                                print(f"You equip the {item.name}.")
-                            else:
-                                print(f"You can't equip the {item.name}.")
-                        else:
-                            print(f"You don't have any {target}.")
-                    else:  # unequip
-                        if hasattr(self.player, "equipped"):
-                            for i in self.player.equipped:
-                                if target.lower() in i.name.lower():
-                                    item = i
-                                    break
-
-                            if item:
-                                self.player.equipped.remove(item)
-                                print(f"You unequip the {item.name}.")
-                            else:
-                                print(f"You don't have {target} equipped.")
-                        else:
-                            print("You don't have anything equipped.")
+                    print(f"You can't use the {item.name}.")
+            else:
+                print(f"You don't have any {target}.")
+        else:
+            print("Use what?")
+
+    def _action_open_close(self, parsed: Dict[str, Any]):
+        """Handle the open/close action"""
+        action = parsed["action"]
+        target = self._target(parsed)
+        if target:
+            features = self.get_current_room().features
+            needle = target.casefold()
+            feature = features.get(needle)
+            if feature is None:
+                feature = next(
+                    (f for name, f in features.items() if name.startswith(needle)), None
+                )
+
+            if feature is None:
+                print(f"You don't see any {target} to {action}.")
+            else:
+                state = _FEATURE_STATES[action]
+                if feature["state"] == state:
+                    print(f"The {target} is already {state}.")
                 else:
-                    print(f"{action.capitalize()} what?")
-                return
-            elif action == "flee":
-                # Try to escape from combat or dangerous situation
-                if hasattr(self, "combat") and self.combat.in_combat:
-                    print("You attempt to flee from combat!")
-                    # Simple flee logic
-                    import random
-
-                    if random.random() > 0.5:
-                        self.combat.in_combat = False
-                        print("You successfully escaped!")
+                    feature["state"] = state
+                    print(f"You {action} the {target}.")
+        else:
+            print(_WHAT_PROMPTS[action])
+
+    def _action_equip(self, parsed: Dict[str, Any]):
+        """Handle the equip/unequip action"""
+        action = parsed["action"]
+        target = self._target(parsed)
+        if target:
+            item = None
+            if action == "equip":
+                equipped = self.player.equipped
+                # Of several like-named items, equip one not already worn
+                item = self._resolve(
+                    target, [i for i in self.player.inventory if i.id not in equipped]
+                ) or self.player.inventory.find(target)
+
+                if item:
+                    if item.id in equipped:
+                        print(f"You already have the {item.name} equipped.")
+                    elif item.equippable:
+                        equipped[item.id] = item
+                        print(f"You equip the {item.name}.")
                     else:
-                        print("You couldn't get away!")
+                        print(f"You can't equip the {item.name}.")
                 else:
-                    # Not in combat, just move to random exit
-                    room = self.get_current_room()
-                    if room.exits:
-                        import random
-
-                        direction = random.choice(list(room.exits.keys()))
-                        print(f"You flee {direction}!")
-                        self.move(direction)
-                    else:
-                        print("There's nowhere to flee!")
-                return
-            elif action == "give":
-                target = parsed.get("target", "")
-                recipient = parsed.get("recipient", "")
-                if target and recipient:
-                    # Find item in inventory
-                    item = None
-                    for i in self.player.inventory:
-                        if target.lower() in i.name.lower():
-                            item = i
-                            break
+                    print(f"You don't have any {target}.")
+            else:  # unequip
+                equipped = self.player.equipped
+                if equipped:
+                    item = self._resolve(target, equipped.values())
 
                     if item:
-                        # Find NPC
-                        room = self.get_current_room()
-                        monsters = self.get_monsters_in_room(room.id)
-                        npc = None
-                        for m in monsters:
-                            if recipient.lower() in m.name.lower():
-                                npc = m
-                                break
-
-                        if npc:
-                            self.player.inventory.remove(item)
-                            if hasattr(npc, "inventory"):
-                                npc.inventory.append(item)
-                            print(f"You give the {item.name} to {npc.name}.")
-                        else:
-                            print(f"You don't see any {recipient} here.")
-                    else:
-                        print(f"You don't have any {target}.")
-                else:
-                    print("Give what to whom?")
-                return
-            elif action == "quests":
-                # Show active quests
-                if hasattr(self.player, "quests") and self.player.quests:
-                    print("\n=== Active Quests ===")
-                    for quest in self.player.quests:
-                        status = "Complete" if quest.completed else "Active"
-                        print(f"[{status}] {quest.name}")
-                        print(f"  {quest.description}")
-                else:
-                    print("You have no active quests.")
-                return
-            elif action == "dismiss":
-                target = parsed.get("target", "")
-                if target:
-                    if hasattr(self.player, "party"):
-                        companion = None
-                        for c in self.player.party:
-                            if target.lower() in c.name.lower():
-                                companion = c
-                                break
-
-                        if companion:
-                            self.player.party.remove(companion)
-                            print(f"{companion.name} has left your party.")
-                        else:
-                            print(f"{target} is not in your party.")
-                    else:
-                        print("You don't have any companions.")
-                else:
-                    print("Dismiss whom?")
-                return
-            elif action == "examine":
-                target = parsed.get("target", "")
-                if target:
-                    # Check if examining an NPC
-                    room = self.get_current_room()
-                    monsters = self.get_monsters_in_room(room.id)
-                    is_npc = any(target.lower() in m.name.lower() for m in monsters)
-                    if is_npc:
-                        self.examine_npc(target)
+                        del equipped[item.id]
+                        print(f"You unequip the {item.name}.")
                     else:
-                        # Examine environmental object or item
-                        self.examine_object(target)
+                        print(f"You don't have {target} equipped.")
                 else:
-                    print("Examine what?")
-                return
-            elif action == "search":
-                self.search_area()
-                return
-            elif action == "talk":
-                target = parsed.get("target", "")
-                topic = parsed.get("topic", "")
-                if target:
-                    self.talk_to_npc(target, topic)
+                    print("You don't have anything equipped.")
+        else:
+            print(_WHAT_PROMPTS[action])
+
+    def _action_flee(self, parsed: Dict[str, Any]):
+        """Handle the flee action"""
+        # Try to escape from combat or dangerous situation
+        if self.combat is not None and self.combat.in_combat:
+            print("You attempt to flee from combat!")
+            # Simple flee logic
+            if self._rng.random() > 0.5:
+                self.combat.in_combat = False
+                print("You successfully escaped!")
+            else:
+                print("You couldn't get away!")
+        else:
+            # Not in combat, just move to random exit
+            room = self.get_current_room()
+            if room.exits:
+                direction = self._rng.choice(list(room.exits))
+                print(f"You flee {direction}!")
+                self.move(direction)
+            else:
+                print("There's nowhere to flee!")
+
+    def _action_give(self, parsed: Dict[str, Any]):
+        """Handle the give action"""
+        target = self._target(parsed)
+        recipient = parsed.get("recipient", "")
+        if target and recipient:
+            # Find item in inventory
+            item = self.player.inventory.find(target)
+
+            if item:
+                # Find NPC
+                room = self.get_current_room()
+                npc = self._resolve(
+                    recipient, self.get_monsters_in_room(room.id)
+                )
+
+                if npc:
+                    self.player.inventory.remove(item)
+                    npc.inventory.append(item)
+                    print(f"You give the {item.name} to {npc.name}.")
                 else:
-                    print("Talk to whom?")
-                return
-            elif action == "question":
-                # Handle questions naturally
-                q_text = parsed.get("text", "")
-                if "where" in q_text.lower():
-                    self.look()
-                elif "what" in q_text.lower() and "carry" in q_text.lower():
-                    self.show_inventory()
-                elif "who" in q_text.lower():
-                    monsters = self.get_monsters_in_room(self.player.current_room)
-                    if monsters:
-                        print("You see:")
-                        for m in monsters:
-                            print(f"  - {m.name}")
-                    else:
-                        print("No one else is here.")
+                    print(f"You don't see any {recipient} here.")
+            else:
+                print(f"You don't have any {target}.")
+        else:
+            print("Give what to whom?")
+
+    def _action_quests(self, parsed: Dict[str, Any]):
+        """Handle the quests action"""
+        # Show active quests
+        if self.player.quests:
+            print("\n=== Active Quests ===")
+            for quest in self.player.quests:
+                status = "Complete" if quest.completed else "Active"
+                print(f"[{status}] {quest.name}")
+                print(f"  {quest.description}")
+        else:
+            print("You have no active quests.")
+
+    def _action_dismiss(self, parsed: Dict[str, Any]):
+        """Handle the dismiss action"""
+        target = self._target(parsed)
+        if target:
+            if self.companions:
+                companion = self.companions.find(target)
+                if companion:
+                    self.companions.remove(companion)
+                    # The NPC stays behind where it was dismissed
+                    npc = self.monsters.get(companion.npc_id)
+                    if npc is not None:
+                        self._move_monster(npc, self.player.current_room)
+                    print(f"{companion.name} has left your party.")
                 else:
-                    print("I'm not sure how to answer that.")
+                    print(f"{target} is not in your party.")
+            else:
+                print("You don't have any companions.")
+        else:
+            print("Dismiss whom?")
+
+    def _action_examine(self, parsed: Dict[str, Any]):
+        """Handle the examine action"""
+        target = self._target(parsed)
+        if target:
+            # Check if examining an NPC
+            room = self.get_current_room()
+            monsters = self.get_monsters_in_room(room.id)
+            if self._resolve(target, monsters) is not None:
+                self.examine_npc(target)
+            else:
+                # Examine environmental object or item
+                self.examine_object(target)
+        else:
+            print("Examine what?")
+
+    def _action_search(self, parsed: Dict[str, Any]):
+        """Handle the search action"""
+        self.search_area()
+
+    def _action_talk(self, parsed: Dict[str, Any]):
+        """Handle the talk action"""
+        target = self._target(parsed)
+        topic = parsed.get("topic", "")
+        if target:
+            self.talk_to_npc(target, topic)
+        else:
+            print("Talk to whom?")
+
+    def _action_question(self, parsed: Dict[str, Any]):
+        """Handle the question action"""
+        match = _QUESTION_RE.search(parsed.get("text", ""))
+        if match:
+            getattr(self, _QUESTION_HANDLERS[match.lastgroup])()
+        else:
+            print("I'm not sure how to answer that.")
+
+    def _show_who(self):
+        """List who else is in the current room"""
+        monsters = self.get_monsters_in_room(self.player.current_room)
+        if monsters:
+            print("You see:")
+            for m in monsters:
+                print(f"  - {m.name}")
+        else:
+            print("No one else is here.")
+
+    def _action_achievements(self, parsed: Dict[str, Any]):
+        """Handle the achievements action"""
+        if self.achievements:
+            print("\n" + self.achievements.get_progress_summary())
+        else:
+            print("Achievements not available.")
+
+    def _action_journal(self, parsed: Dict[str, Any]):
+        """Handle the journal action"""
+        if self.journal:
+            entries = self.journal.get_recent_entries(10)
+            print("\n=== Recent Journal Entries ===")
+            for entry in entries:
+                print(f"\n[{entry.timestamp}] {entry.title}")
+                print(f"  {entry.content}")
+        else:
+            print("Journal not available.")
+
+    def _action_settings(self, parsed: Dict[str, Any]):
+        """Handle the settings action"""
+        if self.accessibility:
+            print("\n=== Game Settings ===")
+            print(f"Difficulty: {self.accessibility.difficulty.level.value}")
+            print(f"Text Size: {self.accessibility.display.text_size.value}")
+            print(
+                f"Colors: {'Enabled' if self.accessibility.display.use_colors else 'Disabled'}"
+            )
+        else:
+            print("Settings not available.")
+
+    def process_command(self, command: str):
+        """Process a player command
+
+        Everything the command prints is collected and written to stdout in
+        one go, rather than a write per line.
+        """
+        buffer = io.StringIO()
+        try:
+            with redirect_stdout(buffer):
+                self._dispatch_command(command)
+        finally:
+            sys.stdout.write(buffer.getvalue())
+
+    def _dispatch_command(self, command: str):
+        """Parse a player command and run its action handler"""
+        # Process with smart command system if available
+        if self.command_system:
+            # Fix typos and process
+            command = self.command_system.process_input(command)
+            # Add to history
+            self.command_system.add_to_history(command)
+
+        # Try enhanced parser first
+        if self.use_enhanced_parser and self.parser:
+            parsed = self.parser.parse_command(command)
+            handler = self._action_table.get(parsed.get("action"))
+            if handler:
+                handler(parsed)
                 return
 
-        # Fall back to simple parser
-        parts = command.lower().strip().split()
+        self._run_simple_command(command)
+
+    def _run_simple_command(self, command: str):
+        """Run a command with the simple verb-and-rest parser"""
+        parts = command.lower().split()
         if not parts:
             return
 
         cmd = parts[0]
-        args = " ".join(parts[1:]) if len(parts) > 1 else ""
-
-        # Movement commands
-        if cmd in ["n", "north"]:
-            self.move("north")
-        elif cmd in ["s", "south"]:
-            self.move("south")
-        elif cmd in ["e", "east"]:
-            self.move("east")
-        elif cmd in ["w", "west"]:
-            self.move("west")
-        elif cmd in ["u", "up"]:
-            self.move("up")
-        elif cmd in ["d", "down"]:
-            self.move("down")
-
-        # Action commands
-        elif cmd in ["l", "look"]:
-            self.look()
-        elif cmd in ["i", "inventory"]:
-            self.show_inventory()
-        elif cmd in ["status", "stats"]:
-            self.show_status()
-        elif cmd in ["party"]:
-            self.show_party()
-        elif cmd in ["recruit", "invite"]:
-            if args:
-                self.recruit_companion(args)
-            else:
-                print("Recruit who?")
-        elif cmd in ["get", "take"]:
-            if args:
-                self.get_item(args)
-            else:
-                print("Get what?")
-        elif cmd in ["drop"]:
-            if args:
-                self.drop_item(args)
-            else:
-                print("Drop what?")
-        elif cmd in ["attack", "kill", "fight"]:
-            if args:
-                self.attack(args)
-            else:
-                print("Attack what?")
-        elif cmd in ["quit", "exit", "q"]:
-            print("\nThanks for playing!")
-            self.game_over = True
-        elif cmd in ["help", "h", "?"]:
-            self.show_help()
-        elif cmd in ["achievements"]:
-            if self.achievements:
-                print("\n" + self.achievements.get_progress_summary())
-            else:
-                print("Achievements not available.")
-        elif cmd in ["journal", "notes"]:
-            if self.journal:
-                entries = self.journal.get_recent_entries(10)
-                print("\n=== Recent Journal Entries ===")
-                for entry in entries:
-                    print(f"\n[{entry.timestamp}] {entry.title}")
-                    print(f"  {entry.content}")
-            else:
-                print("Journal not available.")
-        elif cmd in ["settings"]:
-            if self.accessibility:
-                print("\n=== Game Settings ===")
-                print(f"Difficulty: {self.accessibility.difficulty.level.value}")
-                print(f"Text Size: {self.accessibility.display.text_size.value}")
-                print(
-                    f"Colors: {'Enabled' if self.accessibility.display.use_colors else 'Disabled'}"
-                )
-            else:
-                print("Settings not available.")
+        args = " ".join(parts[1:])
+
+        direction = _SIMPLE_DIRECTIONS.get(cmd)
+        if direction:
+            self.move(direction)
+            return
+
+        action = _SIMPLE_VERBS.get(cmd)
+        if action:
+            # Here "look" always describes the room, whatever follows it
+            target = "" if action == "look" else args
+            self._action_table[action]({"action": action, "target": target})
         else:
             print(f"I don't understand '{command}'. Type 'help' for commands.")
 
@@ -1289,35 +1684,27 @@ class AdventureGame:
         if self.use_enhanced_parser and self.parser:
             print(self.parser.get_help_text())
         else:
-            print("\n" + "=" * 60)
-            print("ADVENTURE COMMANDS")
-            print("=" * 60)
-            print("\nMovement:")
-            print("  n, north, s, south, e, east, w, west, u, up, d, down")
-            print("\nActions:")
-            print("  look (l)        - Look around")
-            print("  get/take <item> - Pick up an item")
-            print("  drop <item>     - Drop an item")
-            print("  attack <target> - Attack a monster")
-            print("\nParty:")
-            print("  party           - View your companions")
-            print("  recruit <npc>   - Invite NPC to join party")
-            print("\nInfo:")
-            print("  inventory (i)   - Show what you're carrying")
-            print("  status          - Show your character stats")
-            print("  help (h, ?)     - Show this help")
-            print("\nOther:")
-            print("  quit (q)        - Exit the game")
-            print("=" * 60 + "\n")
+            print(_SIMPLE_HELP)
 
     def run(self):
         """Main game loop"""
         self.load_adventure()
         self.look()
 
+        # Terminals keep input()'s line editing; piped input such as a
+        # replayed session is read straight off stdin
+        interactive = sys.stdin.isatty()
         while not self.game_over:
             try:
-                command = input("\n> ").strip()
+                if interactive:
+                    line = input("\n> ")
+                else:
+                    sys.stdout.write("\n> ")
+                    sys.stdout.flush()
+                    line = sys.stdin.readline()
+                    if not line:
+                        break
+                command = line.strip()
                 if command:
                     self.process_command(command)
             except KeyboardInterrupt:
@@ -114,7 +114,40 @@ class EventBus:
             self._subscriptions[event_name].append(subscription)
             self._subscriptions[event_name].sort()
 
-        self.logger.debug(f"Subscribed {plugin_name} to {event_name}")
+        self.logger.debug("Subscribed %s to %s", plugin_name, event_name)
+
+    def subscribe_many(self, subscriptions: List[tuple]):
+        """
+        Subscribe several handlers at once
+
+        Each affected handler list is sorted once after all insertions,
+        rather than once per subscription.
+
+        Args:
+            subscriptions: (event_name, handler, priority, plugin_name) tuples
+        """
+        touched = set()
+        for event_name, handler, priority, plugin_name in subscriptions:
+            subscription = EventSubscription(
+                event_name=event_name,
+                handler=handler,
+                priority=priority,
+                plugin_name=plugin_name,
+            )
+
+            if event_name == "*":
+                self._wildcard_subscriptions.append(subscription)
+            else:
+                self._subscriptions.setdefault(event_name, []).append(subscription)
+            touched.add(event_name)
+
+        for event_name in touched:
+            if event_name == "*":
+                self._wildcard_subscriptions.sort()
+            else:
+                self._subscriptions[event_name].sort()
+
+        self.logger.debug("Subscribed %d handlers", len(subscriptions))
 
     def unsubscribe(self, event_name: str, handler: Callable):
         """
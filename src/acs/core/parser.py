@@ -6,6 +6,7 @@ and support for party/companion system
 """
 
 import re
+from functools import cached_property
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
@@ -476,6 +477,16 @@ class Companion:
         self.inventory = []
         self.equipped_weapon = None
 
+    @cached_property
+    def name_cf(self) -> str:
+        """Casefolded name, for caseless lookups"""
+        return self.name.casefold()
+
+    @cached_property
+    def name_tokens(self) -> tuple:
+        """Words of the casefolded name, in order"""
+        return tuple(re.findall(r"\w+", self.name_cf))
+
     def take_damage(self, amount: int):
         """Companion takes damage"""
         self.current_health -= amount
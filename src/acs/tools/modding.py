@@ -4,7 +4,15 @@ Adventure Construction Set - Modding & Scripting Support
 Allow adventure creators to extend functionality with Python scripts
 """
 
-from typing import Any, Dict, List, Optional
+import ast
+import bisect
+import heapq
+import io
+import logging
+import textwrap
+import tokenize
+from types import CodeType, ModuleType
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -28,7 +36,66 @@ class EventType(Enum):
     ON_LOAD = "on_load"
 
 
-@dataclass
+_MISSING = object()
+
+
+def _match_all(event_data: Dict[str, Any]) -> bool:
+    """Filter used by hooks without filter_params"""
+    return True
+
+
+def _make_equals_check(key: str, expected: Any) -> Callable[[Dict[str, Any]], bool]:
+    """Build a check that event_data[key] equals expected"""
+
+    def check(event_data: Dict[str, Any]) -> bool:
+        actual = event_data.get(key, _MISSING)
+        return actual is not _MISSING and actual == expected
+
+    return check
+
+
+def _make_member_check(key: str, allowed: list) -> Callable[[Dict[str, Any]], bool]:
+    """Build a check that event_data[key] is one of the allowed values"""
+    try:
+        allowed = frozenset(allowed)
+    except TypeError:  # Unhashable filter values, keep list membership
+        pass
+
+    def check(event_data: Dict[str, Any]) -> bool:
+        if key not in event_data:
+            return False
+        try:
+            return event_data[key] in allowed
+        except TypeError:  # Unhashable event value can't be in the set
+            return False
+
+    return check
+
+
+def _make_filter(filter_params: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+    """Compile filter_params into a single event_data predicate"""
+    if not filter_params:
+        return _match_all
+
+    checks = [
+        _make_member_check(key, value)
+        if isinstance(value, list)
+        else _make_equals_check(key, value)
+        for key, value in filter_params.items()
+    ]
+    if len(checks) == 1:
+        return checks[0]
+
+    def matches(event_data: Dict[str, Any]) -> bool:
+        for check in checks:
+            if not check(event_data):
+                return False
+        return True
+
+    return matches
+
+
+@dataclass(slots=True)
 class ScriptHook:
     """A script that runs in response to an event"""
 
@@ -37,24 +104,39 @@ class ScriptHook:
     priority: int = 0  # Higher priority runs first
     enabled: bool = True
     filter_params: Dict[str, Any] = field(default_factory=dict)
+    _compiled: Optional[CodeType] = field(default=None, repr=False, compare=False)
+    # Set by ModdingSystem.register_hook
+    _order: int = field(default=0, init=False, repr=False, compare=False)
+    _index_key: Optional[Tuple[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _needs_filter_check: bool = field(
+        default=False, init=False, repr=False, compare=False
+    )
+    _filter_fn: Callable[[Dict[str, Any]], bool] = field(
+        default=_match_all, init=False, repr=False, compare=False
+    )
+    _callable: Optional[Callable] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        self._filter_fn = _make_filter(self.filter_params)
+
+    def get_code(self) -> CodeType:
+        """Get the compiled script, compiling it on first use"""
+        if self._compiled is None:
+            self._compiled = compile(
+                self.script_code, f"<hook:{self.event.value}>", "exec"
+            )
+        return self._compiled
 
     def matches_filter(self, event_data: Dict[str, Any]) -> bool:
         """Check if event matches filter parameters"""
-        if not self.filter_params:
-            return True
-
-        for key, value in self.filter_params.items():
-            if key not in event_data:
-                return False
-            if isinstance(value, list):
-                if event_data[key] not in value:
-                    return False
-            elif event_data[key] != value:
-                return False
-        return True
+        return self._filter_fn(event_data)
 
 
-@dataclass
+@dataclass(slots=True)
 class CustomCommand:
     """A custom command added by a mod"""
 
@@ -63,14 +145,188 @@ class CustomCommand:
     handler_code: str
     help_text: str = ""
     hidden: bool = False
+    _compiled: Optional[CodeType] = field(default=None, repr=False, compare=False)
+    # Set by ModdingSystem.register_command
+    _callable: Optional[Callable] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def get_code(self) -> CodeType:
+        """Get the compiled handler, compiling it on first use"""
+        if self._compiled is None:
+            self._compiled = compile(
+                self.handler_code, f"<command:{self.verb}>", "exec"
+            )
+        return self._compiled
+
+
+def _hook_sort_key(hook: ScriptHook) -> Tuple[int, int]:
+    """Sort key placing higher-priority hooks first, ties by registration"""
+    return (-hook.priority, hook._order)
+
+
+def _filter_index_key(filter_params: Dict[str, Any]) -> Optional[Tuple[str, Any]]:
+    """Get the (key, value) bucket for a single scalar filter, if indexable"""
+    if len(filter_params) != 1:
+        return None
+    ((key, value),) = filter_params.items()
+    if isinstance(value, list):
+        return None
+    try:
+        hash(value)
+    except TypeError:
+        return None
+    return (key, value)
+
+
+def _precompile(script) -> None:
+    """Compile a hook/command script up front.
+
+    Syntax errors are left for the first trigger to report, so a single
+    broken script does not prevent the rest of a mod from loading.
+    """
+    try:
+        script.get_code()
+    except SyntaxError:
+        pass
+
+
+# Token types whose text may span lines (f-strings tokenize in parts on 3.12+)
+_STRING_TOKENS = {tokenize.STRING, getattr(tokenize, "FSTRING_MIDDLE", tokenize.STRING)}
+
+
+def _build_script_function(
+    source: str, filename: str, namespace: Dict[str, Any]
+) -> Optional[Callable]:
+    """Wrap script source in a function so each run is a plain call.
+
+    The function takes (data, player, room); every other namespace binding
+    becomes a default argument, so scripts read them as fast locals.
+    Returns None for scripts that can't be wrapped faithfully, such as
+    ones with multi-line string literals that indenting would alter.
+    """
+    source = textwrap.dedent(source)
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(source).readline):
+            if token.type in _STRING_TOKENS and token.start[0] != token.end[0]:
+                return None
+    except (tokenize.TokenError, SyntaxError):
+        return None
+
+    bindings = ", ".join(f"{name}={name}" for name in namespace)
+    wrapped = (
+        f"def __script(data, player, room, {bindings}):\n"
+        + textwrap.indent(source, "    ")
+        + "\n    pass\n"
+    )
+    try:
+        code = compile(wrapped, filename, "exec")
+    except SyntaxError:
+        return None
+
+    scope = dict(namespace)
+    exec(code, scope)
+    return scope["__script"]
+
+
+_MOD_CLASSES = {"ScriptHook": ScriptHook, "CustomCommand": CustomCommand}
+_MOD_REGISTER = {"register_hook": ScriptHook, "register_command": CustomCommand}
+
+
+class _NotDeclarative(Exception):
+    """Raised when a mod file needs to be executed rather than read"""
+
+
+def _mod_value(node: ast.expr) -> Any:
+    """Evaluate a literal argument in a declarative mod file"""
+    if (
+        isinstance(node, ast.Attribute)
+        and isinstance(node.value, ast.Name)
+        and node.value.id == "EventType"
+        and node.attr in EventType.__members__
+    ):
+        return EventType[node.attr]
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        raise _NotDeclarative from None
+
+
+def _mod_object(node: ast.expr, names: Dict[str, Any]) -> Any:
+    """Build a ScriptHook/CustomCommand from a constructor call or a name"""
+    if isinstance(node, ast.Name) and node.id in names:
+        return names[node.id]
+    if not (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in _MOD_CLASSES
+    ):
+        raise _NotDeclarative
+    if any(kw.arg is None for kw in node.keywords) or any(
+        isinstance(arg, ast.Starred) for arg in node.args
+    ):
+        raise _NotDeclarative
+    args = [_mod_value(arg) for arg in node.args]
+    kwargs = {kw.arg: _mod_value(kw.value) for kw in node.keywords}
+    return _MOD_CLASSES[node.func.id](*args, **kwargs)
+
+
+def _read_declarative_mod(tree: ast.Module) -> Optional[List[Any]]:
+    """Get the hooks/commands a mod registers without executing it.
+
+    Handles mods made only of docstrings, `name = ScriptHook(...)` /
+    `CustomCommand(...)` assignments with literal arguments, and
+    register_hook/register_command calls. Returns None for anything
+    else, in which case the mod has to be executed.
+    """
+    names: Dict[str, Any] = {}
+    registered: List[Any] = []
+    try:
+        for stmt in tree.body:
+            if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant):
+                continue  # Docstring or bare literal
+            if (
+                isinstance(stmt, ast.Assign)
+                and len(stmt.targets) == 1
+                and isinstance(stmt.targets[0], ast.Name)
+            ):
+                names[stmt.targets[0].id] = _mod_object(stmt.value, names)
+                continue
+            if (
+                isinstance(stmt, ast.Expr)
+                and isinstance(stmt.value, ast.Call)
+                and isinstance(stmt.value.func, ast.Name)
+                and stmt.value.func.id in _MOD_REGISTER
+                and len(stmt.value.args) == 1
+                and not stmt.value.keywords
+            ):
+                obj = _mod_object(stmt.value.args[0], names)
+                if not isinstance(obj, _MOD_REGISTER[stmt.value.func.id]):
+                    raise _NotDeclarative
+                registered.append(obj)
+                continue
+            raise _NotDeclarative
+    except (_NotDeclarative, TypeError):
+        return None
+    return registered
 
 
 class ScriptContext:
     """Safe execution context for mod scripts"""
 
+    __slots__ = (
+        "engine",
+        "output_buffer",
+        "_allowed_modules",
+        "_module_bindings",
+    )
+
     def __init__(self, engine=None):
         self.engine = engine
         self.output_buffer = []
+        # Create the flag store once so flag helpers need no hasattr checks
+        if engine is not None and not hasattr(engine, "script_flags"):
+            engine.script_flags = {}
         self._allowed_modules = {
             "math",
             "random",
@@ -79,6 +335,23 @@ class ScriptContext:
             "datetime",
             "collections",
         }
+        # Resolve the allowed modules once rather than on every script run
+        self._module_bindings: Dict[str, ModuleType] = {}
+        for module in self._allowed_modules:
+            try:
+                self._module_bindings[module] = __import__(module)
+            except ImportError:
+                pass
+
+    def begin_capture(self) -> int:
+        """Start capturing script output; returns a marker for end_capture"""
+        return len(self.output_buffer)
+
+    def end_capture(self, start: int) -> List[str]:
+        """Remove and return the output written since begin_capture"""
+        output = self.output_buffer[start:]
+        del self.output_buffer[start:]
+        return output
 
     def print(self, *args, **kwargs):
         """Capture print output"""
@@ -107,8 +380,9 @@ class ScriptContext:
         """Get NPC by name"""
         if not self.engine:
             return None
+        key = name.lower()
         for npc in self.engine.current_room.npcs:
-            if npc.name.lower() == name.lower():
+            if npc.name.lower() == key:
                 return npc
         return None
 
@@ -116,16 +390,12 @@ class ScriptContext:
         """Get item by name from room or inventory"""
         if not self.engine:
             return None
-
-        # Check player inventory
-        for item in self.engine.player.inventory:
-            if item.name.lower() == name.lower():
-                return item
-
-        # Check room
-        for item in self.engine.current_room.items:
-            if item.name.lower() == name.lower():
-                return item
+        key = name.lower()
+        # Check player inventory, then room
+        for items in (self.engine.player.inventory, self.engine.current_room.items):
+            for item in items:
+                if item.name.lower() == key:
+                    return item
         return None
 
     def spawn_item(self, item_name: str, room_id: Optional[int] = None):
@@ -146,13 +416,11 @@ class ScriptContext:
     def set_flag(self, flag_name: str, value: Any = True):
         """Set a global flag"""
         if self.engine:
-            if not hasattr(self.engine, "script_flags"):
-                self.engine.script_flags = {}
             self.engine.script_flags[flag_name] = value
 
     def get_flag(self, flag_name: str, default: Any = None):
         """Get a global flag"""
-        if self.engine and hasattr(self.engine, "script_flags"):
+        if self.engine:
             return self.engine.script_flags.get(flag_name, default)
         return default
 
@@ -165,105 +433,204 @@ class ModdingSystem:
     """System for loading and executing mod scripts"""
 
     def __init__(self, engine=None):
+        self.logger = logging.getLogger("ModdingSystem")
         self.engine = engine
-        self.hooks: Dict[EventType, List[ScriptHook]] = {
-            event: [] for event in EventType
-        }
+        # Keyed by EventType value; only events with hooks get an entry
+        self.hooks: Dict[str, List[ScriptHook]] = {}
+        # Dispatch tables: hooks without filters always run, hooks with a
+        # single scalar filter are bucketed by (key, value), and the rest
+        # are checked with matches_filter
+        self._hooks_unfiltered: Dict[str, List[ScriptHook]] = {}
+        self._hooks_filtered: Dict[str, List[ScriptHook]] = {}
+        self._filter_index: Dict[
+            str, Dict[Tuple[str, Any], List[ScriptHook]]
+        ] = {}
+        self._index_keys: Dict[str, Dict[str, int]] = {}
+        self._hook_count = 0
         self.custom_commands: Dict[str, CustomCommand] = {}
+        self._commands_unique: List[CustomCommand] = []
         self.script_context = ScriptContext(engine)
+        self._base_namespace = self._build_base_namespace()
+
+    def _build_base_namespace(self) -> Dict[str, Any]:
+        """Build the script bindings that do not change between triggers"""
+        ctx = self.script_context
+        namespace = {
+            "ctx": ctx,
+            "print": ctx.print,
+            "echo": ctx.echo,
+            # Utility functions
+            "get_npc": ctx.get_npc,
+            "get_item": ctx.get_item,
+            "spawn_item": ctx.spawn_item,
+            "spawn_npc": ctx.spawn_npc,
+            "set_flag": ctx.set_flag,
+            "get_flag": ctx.get_flag,
+            "has_flag": ctx.has_flag,
+        }
+        namespace.update(ctx._module_bindings)
+        return namespace
 
     def register_hook(self, hook: ScriptHook):
         """Register an event hook"""
-        if hook.event not in self.hooks:
-            self.hooks[hook.event] = []
-        self.hooks[hook.event].append(hook)
-        # Sort by priority (highest first)
-        self.hooks[hook.event].sort(key=lambda h: h.priority, reverse=True)
+        _precompile(hook)
+        hook._callable = self._script_function(hook)
+        self._hook_count += 1
+        hook._order = self._hook_count
+        hook._index_key = _filter_index_key(hook.filter_params)
+        # Rebuilt in case filter_params was edited after the hook was created
+        hook._filter_fn = _make_filter(hook.filter_params)
+        event_key = hook.event.value
+
+        # Keep sorted by priority (highest first, ties in registration order)
+        bisect.insort(
+            self.hooks.setdefault(event_key, []), hook, key=_hook_sort_key
+        )
+
+        hook._needs_filter_check = False
+        if not hook.filter_params:
+            bucket = self._hooks_unfiltered.setdefault(event_key, [])
+        elif hook._index_key is None:
+            hook._needs_filter_check = True
+            bucket = self._hooks_filtered.setdefault(event_key, [])
+        else:
+            key_counts = self._index_keys.setdefault(event_key, {})
+            filter_key = hook._index_key[0]
+            key_counts[filter_key] = key_counts.get(filter_key, 0) + 1
+            index = self._filter_index.setdefault(event_key, {})
+            bucket = index.setdefault(hook._index_key, [])
+        bisect.insort(bucket, hook, key=_hook_sort_key)
+
+    def _candidate_hooks(
+        self, event: str, event_data: Dict[str, Any]
+    ) -> Iterable[ScriptHook]:
+        """Get hooks that may match event_data, in priority order"""
+        sources = []
+        for table in (self._hooks_unfiltered, self._hooks_filtered):
+            hooks = table.get(event)
+            if hooks:
+                sources.append(hooks)
+
+        index = self._filter_index.get(event)
+        if index:
+            for key in self._index_keys[event]:
+                if key not in event_data:
+                    continue
+                try:
+                    bucket = index.get((key, event_data[key]))
+                except TypeError:  # Unhashable event value
+                    continue
+                if bucket:
+                    sources.append(bucket)
+
+        if not sources:
+            return ()
+        if len(sources) == 1:
+            return sources[0]
+        return heapq.merge(*sources, key=_hook_sort_key)
+
+    def _script_function(self, script) -> Optional[Callable]:
+        """Build the persistent function for a compiled hook or command"""
+        if script._compiled is None:
+            return None
+        source = (
+            script.script_code
+            if isinstance(script, ScriptHook)
+            else script.handler_code
+        )
+        return _build_script_function(
+            source, script._compiled.co_filename, self._base_namespace
+        )
 
     def register_command(self, command: CustomCommand):
         """Register a custom command"""
-        self.custom_commands[command.verb] = command
+        _precompile(command)
+        command._callable = self._script_function(command)
+        verb = command.verb.casefold()
+        # Re-registering a verb replaces the old command in the help listing
+        self._commands_unique = [
+            c for c in self._commands_unique if c.verb.casefold() != verb
+        ]
+        self._commands_unique.append(command)
+        # Dispatch keys are casefolded so lookups ignore case
+        self.custom_commands[verb] = command
         for alias in command.aliases:
-            self.custom_commands[alias] = command
-
-    def trigger_event(self, event: EventType, event_data: Dict[str, Any]) -> List[str]:
-        """Trigger an event and run associated hooks"""
-        output = []
-
-        if event not in self.hooks:
-            return output
-
-        for hook in self.hooks[event]:
+            self.custom_commands[alias.casefold()] = command
+
+    def trigger_event(
+        self, event: Union[EventType, str], event_data: Dict[str, Any]
+    ) -> List[str]:
+        """Trigger an event (EventType or its string value) and run its hooks"""
+        if isinstance(event, EventType):
+            event = event.value
+        # Most events have no hooks; skip all dispatch work for them
+        if not self.hooks.get(event):
+            return []
+
+        start = self.script_context.begin_capture()
+        for hook in self._candidate_hooks(event, event_data):
             if not hook.enabled:
                 continue
-            if not hook.matches_filter(event_data):
+            # Unfiltered and indexed hooks need no per-hook filter call
+            if hook._needs_filter_check and not hook._filter_fn(event_data):
                 continue
+            self._execute_script(hook, event_data)
 
-            try:
-                result = self._execute_script(hook.script_code, event_data)
-                if result:
-                    output.extend(result)
-            except Exception as e:
-                output.append(f"[Script Error: {e}]")
-
-        return output
+        return self.script_context.end_capture(start)
 
     def execute_custom_command(self, verb: str, args: str) -> Optional[List[str]]:
         """Execute a custom command if registered"""
-        if verb not in self.custom_commands:
+        command = self.custom_commands.get(verb.casefold())
+        if command is None:
             return None
 
-        command = self.custom_commands[verb]
         event_data = {"verb": verb, "args": args, "command": f"{verb} {args}"}
 
-        try:
-            return self._execute_script(command.handler_code, event_data)
-        except Exception as e:
-            return [f"[Command Error: {e}]"]
-
-    def _execute_script(self, code: str, event_data: Dict[str, Any]) -> List[str]:
-        """Execute script code in safe context"""
-        # Reset output buffer
-        self.script_context.output_buffer = []
+        start = self.script_context.begin_capture()
+        self._execute_script(command, event_data)
+        return self.script_context.end_capture(start)
 
-        # Create execution namespace
-        namespace = {
-            "ctx": self.script_context,
-            "data": event_data,
-            "print": self.script_context.print,
-            "echo": self.script_context.echo,
-            "player": self.script_context.get_player(),
-            "room": self.script_context.get_room(),
-            # Utility functions
-            "get_npc": self.script_context.get_npc,
-            "get_item": self.script_context.get_item,
-            "spawn_item": self.script_context.spawn_item,
-            "spawn_npc": self.script_context.spawn_npc,
-            "set_flag": self.script_context.set_flag,
-            "get_flag": self.script_context.get_flag,
-            "has_flag": self.script_context.has_flag,
-        }
+    def _execute_script(self, script, event_data: Dict[str, Any]):
+        """Execute a hook or command script in safe context
 
-        # Import allowed modules
-        for module in self.script_context._allowed_modules:
-            try:
-                namespace[module] = __import__(module)
-            except ImportError:
-                pass
+        Output is appended to the shared script_context.output_buffer; if the
+        script fails, its partial output is replaced by the error message.
+        """
+        buffer = self.script_context.output_buffer
+        mark = len(buffer)
 
-        # Execute code
         try:
-            exec(code, namespace)
+            player = self.script_context.get_player()
+            room = self.script_context.get_room()
+            if script._callable is not None:
+                script._callable(event_data, player, room)
+            else:
+                # Create execution namespace from the prebuilt static bindings
+                namespace = self._base_namespace.copy()
+                namespace["data"] = event_data
+                namespace["player"] = player
+                namespace["room"] = room
+                exec(script.get_code(), namespace)
         except Exception as e:
-            return [f"[Script Error: {e}]"]
-
-        return self.script_context.output_buffer
+            del buffer[mark:]
+            buffer.append(f"[Script Error: {e}]")
 
     def load_mod_file(self, filepath: str) -> bool:
         """Load a mod from a Python file"""
         try:
             with open(filepath, "r") as f:
                 code = f.read()
+            tree = ast.parse(code, filepath)
+
+            # Declarative mods are registered straight from the syntax tree
+            declared = _read_declarative_mod(tree)
+            if declared is not None:
+                for obj in declared:
+                    if isinstance(obj, ScriptHook):
+                        self.register_hook(obj)
+                    else:
+                        self.register_command(obj)
+                return True
 
             # Execute mod file to register hooks/commands
             namespace = {
@@ -274,21 +641,19 @@ class ModdingSystem:
                 "EventType": EventType,
             }
 
-            exec(code, namespace)
+            exec(compile(tree, filepath, "exec"), namespace)
             return True
         except Exception as e:
-            print(f"Error loading mod {filepath}: {e}")
+            self.logger.error("Error loading mod %s: %s", filepath, e, exc_info=True)
             return False
 
     def get_custom_command_help(self) -> List[str]:
         """Get help text for custom commands"""
         help_lines = []
 
-        seen = set()
-        for verb, command in self.custom_commands.items():
-            if command.verb in seen or command.hidden:
+        for command in self._commands_unique:
+            if command.hidden:
                 continue
-            seen.add(command.verb)
 
             aliases = ", ".join(command.aliases) if command.aliases else ""
             help_text = command.help_text or "Custom command"
@@ -318,9 +683,8 @@ class ModdingSystem:
 
         if "enabled_hooks" in data:
             for hook_data in data["enabled_hooks"]:
-                event = EventType(hook_data["event"])
                 # Find matching hook and set enabled state
-                for hook in self.hooks[event]:
+                for hook in self.hooks.get(hook_data["event"], ()):
                     # Would need better hook identification
                     hook.enabled = hook_data["enabled"]
 
@@ -11,21 +11,18 @@ import os
 import subprocess
 import sys
 import importlib.util
+import codecs
+import queue
+import threading
 from pathlib import Path
 from io import StringIO
+from types import MappingProxyType
 
-
-class AdventureIDE:
-    """Main IDE window for Adventure Construction Set"""
-
-    def __init__(self, root):
-        self.root = root
-        self.root.title("🎮 Adventure Construction Set - IDE")
-        self.root.geometry("1400x900")
-
-        # Theme definitions
-        self.themes = {
-            "Dark": {
+# Color palettes for the View > Theme menu, shared by every IDE window
+THEMES = MappingProxyType(
+    {
+        "Dark": MappingProxyType(
+            {
                 "bg": "#2b2b2b",
                 "fg": "#ffffff",
                 "accent": "#4a90e2",
@@ -39,8 +36,10 @@ class AdventureIDE:
                 "text_bg": "#252525",
                 "button": "#4a90e2",
                 "button_hover": "#357abd",
-            },
-            "Light": {
+            }
+        ),
+        "Light": MappingProxyType(
+            {
                 "bg": "#f5f5f5",
                 "fg": "#333333",
                 "accent": "#4a90e2",
@@ -54,8 +53,10 @@ class AdventureIDE:
                 "text_bg": "#ffffff",
                 "button": "#4a90e2",
                 "button_hover": "#357abd",
-            },
-            "Dracula": {
+            }
+        ),
+        "Dracula": MappingProxyType(
+            {
                 "bg": "#282a36",
                 "fg": "#f8f8f2",
                 "accent": "#bd93f9",
@@ -69,8 +70,10 @@ class AdventureIDE:
                 "text_bg": "#1e1f28",
                 "button": "#bd93f9",
                 "button_hover": "#9d73d9",
-            },
-            "Nord": {
+            }
+        ),
+        "Nord": MappingProxyType(
+            {
                 "bg": "#2e3440",
                 "fg": "#eceff4",
                 "accent": "#88c0d0",
@@ -84,8 +87,10 @@ class AdventureIDE:
                 "text_bg": "#2e3440",
                 "button": "#88c0d0",
                 "button_hover": "#5e81ac",
-            },
-            "Monokai": {
+            }
+        ),
+        "Monokai": MappingProxyType(
+            {
                 "bg": "#272822",
                 "fg": "#f8f8f2",
                 "accent": "#66d9ef",
@@ -99,8 +104,51 @@ class AdventureIDE:
                 "text_bg": "#1e1f1c",
                 "button": "#66d9ef",
                 "button_hover": "#46b9cf",
-            },
-        }
+            }
+        ),
+    }
+)
+
+UI_FONT_FAMILIES = ("Segoe UI", "Arial", "Helvetica", "Verdana", "Tahoma", "Calibri")
+EDITOR_FONT_FAMILIES = (
+    "Consolas",
+    "Courier New",
+    "Monaco",
+    "Menlo",
+    "Source Code Pro",
+    "Fira Code",
+)
+FONT_SIZES = (8, 9, 10, 11, 12, 14, 16)
+
+# Characters of JSON inserted into the preview per idle callback
+PREVIEW_CHUNK_SIZE = 64 * 1024
+
+# Repository root, where the adventures folder and the engine live
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+
+# How often the play console polls a test run for output, in milliseconds
+TEST_OUTPUT_POLL_MS = 50
+
+# (label, exit key) for the room editor's exit spinboxes
+EXIT_DIRECTIONS = (
+    ("North", "north"),
+    ("South", "south"),
+    ("East", "east"),
+    ("West", "west"),
+    ("Up", "up"),
+    ("Down", "down"),
+)
+
+
+class AdventureIDE:
+    """Main IDE window for Adventure Construction Set"""
+
+    def __init__(self, root):
+        self.root = root
+        self.root.title("🎮 Adventure Construction Set - IDE")
+        self.root.geometry("1400x900")
+
+        self.themes = THEMES
 
         # Current theme and font settings
         self.current_theme = "Dark"
@@ -128,136 +176,147 @@ class AdventureIDE:
         self.current_file = None
         self.modified = False
 
+        # Preview JSON and the Info tab fields it was built from; reused until
+        # the adventure is edited or replaced
+        self._preview_cache = None
+        self._adventure_dirty = True
+
+        # Loaded game engine modules by path, with the mtime they were read at
+        self._engine_cache = {}
+
         self.setup_ui()
         self.new_adventure()
 
+    @property
+    def modified(self):
+        """Whether the adventure has unsaved edits"""
+        return self._modified
+
+    @modified.setter
+    def modified(self, value):
+        self._modified = value
+        if value:
+            self._adventure_dirty = True
+
     def setup_styles(self):
         """Configure modern ttk styles"""
-        style = ttk.Style()
-        style.theme_use("clam")  # Use clam as base for customization
+        if not hasattr(self, "_style"):
+            self._style = ttk.Style()
+            self._style.theme_use("clam")  # Use clam as base for customization
+            self._configure_layout(self._style)
+        self._configure_colors(self._style)
+        self._configure_fonts(self._style)
+
+    def _configure_layout(self, style):
+        """Set the style options that don't depend on theme or font"""
+        style.configure("TNotebook", borderwidth=0)
+        style.configure("TNotebook.Tab", padding=[20, 10])
+        style.configure("Panel.TFrame", relief="flat", borderwidth=1)
+        style.configure("TButton", borderwidth=0, padding=[15, 8])
+        style.configure("TEntry", borderwidth=1, relief="flat")
+
+    def _configure_colors(self, style):
+        """Apply the current theme's colors to the ttk styles"""
+        # Read the palette once for every style
+        c = self.colors
+        if c is getattr(self, "_applied_colors", None):
+            return
+        self._applied_colors = c
+        bg, fg, accent, text_bg = c["bg"], c["fg"], c["accent"], c["text_bg"]
 
-        # Configure colors
-        self.root.configure(bg=self.colors["bg"])
+        self.root.configure(bg=bg)
 
         # Notebook (tabs)
-        style.configure("TNotebook", background=self.colors["bg"], borderwidth=0)
-        style.configure(
-            "TNotebook.Tab",
-            background=self.colors["sidebar"],
-            foreground=self.colors["fg"],
-            padding=[20, 10],
-            font=(self.current_font_family, self.current_font_size, "bold"),
-        )
+        style.configure("TNotebook", background=bg)
+        style.configure("TNotebook.Tab", background=c["sidebar"], foreground=fg)
         style.map(
             "TNotebook.Tab",
-            background=[("selected", self.colors["accent"])],
+            background=[("selected", accent)],
             foreground=[("selected", "#ffffff")],
         )
 
         # Frames
-        style.configure("TFrame", background=self.colors["bg"])
-        style.configure(
-            "Panel.TFrame",
-            background=self.colors["panel"],
-            relief="flat",
-            borderwidth=1,
-        )
+        style.configure("TFrame", background=bg)
+        style.configure("Panel.TFrame", background=c["panel"])
 
         # Labels
-        style.configure(
-            "TLabel",
-            background=self.colors["bg"],
-            foreground=self.colors["fg"],
-            font=(self.current_font_family, self.current_font_size),
-        )
-        style.configure(
-            "Title.TLabel",
-            font=(self.current_font_family, self.current_font_size + 4, "bold"),
-            foreground=self.colors["accent"],
-        )
-        style.configure(
-            "Subtitle.TLabel",
-            font=(self.current_font_family, self.current_font_size + 1, "bold"),
-            foreground=self.colors["fg"],
-        )
+        style.configure("TLabel", background=bg, foreground=fg)
+        style.configure("Title.TLabel", foreground=accent)
+        style.configure("Subtitle.TLabel", foreground=fg)
 
         # Buttons
-        style.configure(
-            "TButton",
-            background=self.colors["button"],
-            foreground="#ffffff",
-            borderwidth=0,
-            padding=[15, 8],
-            font=(self.current_font_family, self.current_font_size, "bold"),
-        )
+        style.configure("TButton", background=c["button"], foreground="#ffffff")
         style.map(
             "TButton",
             background=[
-                ("active", self.colors["button_hover"]),
-                ("pressed", self.colors["accent_dark"]),
+                ("active", c["button_hover"]),
+                ("pressed", c["accent_dark"]),
             ],
         )
-
-        # Success button
         style.configure(
-            "Success.TButton", background=self.colors["success"], foreground="#ffffff"
+            "Success.TButton", background=c["success"], foreground="#ffffff"
         )
         style.map("Success.TButton", background=[("active", "#4cae4c")])
-
-        # Warning button
         style.configure(
-            "Warning.TButton", background=self.colors["warning"], foreground="#ffffff"
+            "Warning.TButton", background=c["warning"], foreground="#ffffff"
         )
+        style.configure("Danger.TButton", background=c["danger"], foreground="#ffffff")
 
-        # Danger button
-        style.configure(
-            "Danger.TButton", background=self.colors["danger"], foreground="#ffffff"
-        )
+        # Entry, Spinbox and Combobox
+        style.configure("TEntry", fieldbackground=text_bg, foreground=fg)
+        for widget_style in ("TSpinbox", "TCombobox"):
+            style.configure(
+                widget_style, fieldbackground=text_bg, foreground=fg, arrowcolor=fg
+            )
 
-        # Entry widgets
+        # Record lists
         style.configure(
-            "TEntry",
-            fieldbackground=self.colors["text_bg"],
-            foreground=self.colors["fg"],
-            borderwidth=1,
-            relief="flat",
+            "Treeview", background=text_bg, fieldbackground=text_bg, foreground=fg
         )
-
-        # Spinbox
-        style.configure(
-            "TSpinbox",
-            fieldbackground=self.colors["text_bg"],
-            foreground=self.colors["fg"],
-            arrowcolor=self.colors["fg"],
+        style.map(
+            "Treeview",
+            background=[("selected", accent)],
+            foreground=[("selected", "#ffffff")],
         )
 
-        # Combobox
-        style.configure(
-            "TCombobox",
-            fieldbackground=self.colors["text_bg"],
-            foreground=self.colors["fg"],
-            arrowcolor=self.colors["fg"],
+    def _configure_fonts(self, style):
+        """Apply the current UI font to the ttk styles"""
+        family, size = self.current_font_family, self.current_font_size
+        if (family, size) == getattr(self, "_font_normal", None):
+            return
+        # The same tuple objects go to every style that shares a font
+        self._font_normal = (family, size)
+        self._font_bold = (family, size, "bold")
+
+        style.configure("TNotebook.Tab", font=self._font_bold)
+        style.configure("TLabel", font=self._font_normal)
+        style.configure("Title.TLabel", font=(family, size + 4, "bold"))
+        style.configure("Subtitle.TLabel", font=(family, size + 1, "bold"))
+        style.configure("TButton", font=self._font_bold)
+        style.configure("Treeview", font=self._font_normal, rowheight=size * 2 + 6)
+
+    def _themed_menu(self, parent, bg_key="panel"):
+        """Create a menu in the current theme colors
+
+        The menu is remembered so refresh_all_widgets can recolor it.
+        """
+        c = self.colors
+        menu = tk.Menu(
+            parent, tearoff=0, bg=c[bg_key], fg=c["fg"], activebackground=c["accent"]
         )
+        self._menus.append((menu, bg_key))
+        return menu
 
     def setup_ui(self):
         """Create the main UI"""
+        self._menus = []
+
         # Menu bar with dark theme
-        menubar = tk.Menu(
-            self.root,
-            bg=self.colors["sidebar"],
-            fg=self.colors["fg"],
-            activebackground=self.colors["accent"],
-        )
+        menubar = self._themed_menu(self.root, "sidebar")
         self.root.config(menu=menubar)
 
         # File menu
-        file_menu = tk.Menu(
-            menubar,
-            tearoff=0,
-            bg=self.colors["panel"],
-            fg=self.colors["fg"],
-            activebackground=self.colors["accent"],
-        )
+        file_menu = self._themed_menu(menubar)
         menubar.add_cascade(label="📁 File", menu=file_menu)
         file_menu.add_command(
             label="🆕 New Adventure", command=self.new_adventure, accelerator="Ctrl+N"
@@ -273,13 +332,7 @@ class AdventureIDE:
         file_menu.add_command(label="🚪 Exit", command=self.quit_ide)
 
         # Tools menu
-        tools_menu = tk.Menu(
-            menubar,
-            tearoff=0,
-            bg=self.colors["panel"],
-            fg=self.colors["fg"],
-            activebackground=self.colors["accent"],
-        )
+        tools_menu = self._themed_menu(menubar)
         menubar.add_cascade(label="🛠️ Tools", menu=tools_menu)
         tools_menu.add_command(
             label="▶️ Test Adventure", command=self.test_adventure, accelerator="F5"
@@ -290,23 +343,11 @@ class AdventureIDE:
         # DSK import functionality removed
 
         # View menu
-        view_menu = tk.Menu(
-            menubar,
-            tearoff=0,
-            bg=self.colors["panel"],
-            fg=self.colors["fg"],
-            activebackground=self.colors["accent"],
-        )
+        view_menu = self._themed_menu(menubar)
         menubar.add_cascade(label="👁️ View", menu=view_menu)
 
         # Theme submenu
-        theme_menu = tk.Menu(
-            view_menu,
-            tearoff=0,
-            bg=self.colors["panel"],
-            fg=self.colors["fg"],
-            activebackground=self.colors["accent"],
-        )
+        theme_menu = self._themed_menu(view_menu)
         view_menu.add_cascade(label="🎨 Theme", menu=theme_menu)
         for theme_name in self.themes.keys():
             theme_menu.add_command(
@@ -314,67 +355,29 @@ class AdventureIDE:
             )
 
         # Font submenu
-        font_menu = tk.Menu(
-            view_menu,
-            tearoff=0,
-            bg=self.colors["panel"],
-            fg=self.colors["fg"],
-            activebackground=self.colors["accent"],
-        )
+        font_menu = self._themed_menu(view_menu)
         view_menu.add_cascade(label="🔤 Font", menu=font_menu)
 
         # Font family submenu
-        font_family_menu = tk.Menu(
-            font_menu,
-            tearoff=0,
-            bg=self.colors["panel"],
-            fg=self.colors["fg"],
-            activebackground=self.colors["accent"],
-        )
+        font_family_menu = self._themed_menu(font_menu)
         font_menu.add_cascade(label="Font Family", menu=font_family_menu)
-        for family in [
-            "Segoe UI",
-            "Arial",
-            "Helvetica",
-            "Verdana",
-            "Tahoma",
-            "Calibri",
-        ]:
+        for family in UI_FONT_FAMILIES:
             font_family_menu.add_command(
                 label=family, command=lambda f=family: self.change_font_family(f)
             )
 
         # Font size submenu
-        font_size_menu = tk.Menu(
-            font_menu,
-            tearoff=0,
-            bg=self.colors["panel"],
-            fg=self.colors["fg"],
-            activebackground=self.colors["accent"],
-        )
+        font_size_menu = self._themed_menu(font_menu)
         font_menu.add_cascade(label="Font Size", menu=font_size_menu)
-        for size in [8, 9, 10, 11, 12, 14, 16]:
+        for size in FONT_SIZES:
             font_size_menu.add_command(
                 label=f"{size}pt", command=lambda s=size: self.change_font_size(s)
             )
 
         # Editor font submenu
-        editor_font_menu = tk.Menu(
-            font_menu,
-            tearoff=0,
-            bg=self.colors["panel"],
-            fg=self.colors["fg"],
-            activebackground=self.colors["accent"],
-        )
+        editor_font_menu = self._themed_menu(font_menu)
         font_menu.add_cascade(label="Editor Font", menu=editor_font_menu)
-        for family in [
-            "Consolas",
-            "Courier New",
-            "Monaco",
-            "Menlo",
-            "Source Code Pro",
-            "Fira Code",
-        ]:
+        for family in EDITOR_FONT_FAMILIES:
             editor_font_menu.add_command(
                 label=family, command=lambda f=family: self.change_editor_font(f)
             )
@@ -385,13 +388,7 @@ class AdventureIDE:
         )
 
         # Help menu
-        help_menu = tk.Menu(
-            menubar,
-            tearoff=0,
-            bg=self.colors["panel"],
-            fg=self.colors["fg"],
-            activebackground=self.colors["accent"],
-        )
+        help_menu = self._themed_menu(menubar)
         menubar.add_cascade(label="❓ Help", menu=help_menu)
         help_menu.add_command(label="📖 Quick Start Guide", command=self.show_help)
         help_menu.add_command(label="ℹ️ About", command=self.show_about)
@@ -416,13 +413,24 @@ class AdventureIDE:
         main_frame.columnconfigure(0, weight=1)
         main_frame.rowconfigure(0, weight=1)
 
-        # Create tabs - Play tab first for easy access
+        # Create tabs - Play tab first for easy access. The editor tabs are
+        # only filled with widgets when first selected, see _on_tab_changed
+        self._pending_tabs = {}
+        self._lazy_tabs = []
+        self._queued_selects = set()
         self.create_play_tab()
-        self.create_info_tab()
-        self.create_rooms_tab()
-        self.create_items_tab()
-        self.create_monsters_tab()
-        self.create_preview_tab()
+        self._add_lazy_tab("📋 Info", "20", self.create_info_tab, self.load_info_to_ui)
+        self._add_lazy_tab(
+            "🏠 Rooms", "10", self.create_rooms_tab, self.refresh_rooms_list
+        )
+        self._add_lazy_tab(
+            "⚔️ Items", "10", self.create_items_tab, self.refresh_items_list
+        )
+        self._add_lazy_tab(
+            "👾 Monsters", "10", self.create_monsters_tab, self.refresh_monsters_list
+        )
+        self._add_lazy_tab("📄 JSON", "10", self.create_preview_tab, self.update_preview)
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
 
         # Status bar with color
         status_frame = ttk.Frame(main_frame)
@@ -440,11 +448,28 @@ class AdventureIDE:
         )
         self.status_bar.pack(fill=tk.BOTH, expand=True)
 
-    def create_info_tab(self):
+    def _add_lazy_tab(self, text, padding, build, load):
+        """Add a notebook page whose widgets are built when first selected
+
+        build(frame) creates the page's widgets inside frame, and load()
+        fills them from self.adventure. load runs again on each
+        load_adventure_to_ui once the page exists.
+        """
+        frame = ttk.Frame(self.notebook, padding=padding)
+        self.notebook.add(frame, text=text)
+        self._pending_tabs[str(frame)] = (frame, build, load)
+        self._lazy_tabs.append((str(frame), load))
+
+    def _on_tab_changed(self, event):
+        """Build a lazy tab the first time it is shown"""
+        pending = self._pending_tabs.pop(self.notebook.select(), None)
+        if pending:
+            frame, build, load = pending
+            build(frame)
+            load()
+
+    def create_info_tab(self, frame):
         """Adventure info tab with modern design"""
-        frame = ttk.Frame(self.notebook, padding="20")
-        self.notebook.add(frame, text="📋 Info")
-
         # Header
         header = ttk.Label(frame, text="Adventure Information", style="Title.TLabel")
         header.grid(row=0, column=0, columnspan=2, sticky=tk.W, pady=(0, 20))
@@ -460,22 +485,16 @@ class AdventureIDE:
         ttk.Label(form_frame, text="🎮 Adventure Title:", style="Subtitle.TLabel").grid(
             row=row, column=0, sticky=tk.W, pady=(0, 5)
         )
-        self.title_var = tk.StringVar()
-        title_entry = ttk.Entry(
-            form_frame, textvariable=self.title_var, width=60, font=("Segoe UI", 11)
-        )
-        title_entry.grid(row=row + 1, column=0, sticky=(tk.W, tk.E), pady=(0, 15))
+        self.title_entry = ttk.Entry(form_frame, width=60, font=("Segoe UI", 11))
+        self.title_entry.grid(row=row + 1, column=0, sticky=(tk.W, tk.E), pady=(0, 15))
 
         # Author
         row += 2
         ttk.Label(form_frame, text="👤 Author:", style="Subtitle.TLabel").grid(
             row=row, column=0, sticky=tk.W, pady=(0, 5)
         )
-        self.author_var = tk.StringVar()
-        author_entry = ttk.Entry(
-            form_frame, textvariable=self.author_var, width=60, font=("Segoe UI", 11)
-        )
-        author_entry.grid(row=row + 1, column=0, sticky=(tk.W, tk.E), pady=(0, 15))
+        self.author_entry = ttk.Entry(form_frame, width=60, font=("Segoe UI", 11))
+        self.author_entry.grid(row=row + 1, column=0, sticky=(tk.W, tk.E), pady=(0, 15))
 
         # Start room
         row += 2
@@ -532,26 +551,15 @@ class AdventureIDE:
         )
         save_btn.grid(row=row, column=0, sticky=tk.E, pady=(10, 0))
 
-    def create_rooms_tab(self):
+    def create_rooms_tab(self, frame):
         """Rooms editor tab"""
-        frame = ttk.Frame(self.notebook, padding="10")
-        self.notebook.add(frame, text="🏠 Rooms")
-
         # Left panel - room list
         left_panel = ttk.Frame(frame)
         left_panel.grid(row=0, column=0, sticky=(tk.N, tk.S), padx=5)
 
         ttk.Label(left_panel, text="Rooms:").pack()
 
-        self.rooms_listbox = tk.Listbox(left_panel, width=30, height=25)
-        self.rooms_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        self.rooms_listbox.bind("<<ListboxSelect>>", self.select_room)
-
-        scrollbar = ttk.Scrollbar(
-            left_panel, orient=tk.VERTICAL, command=self.rooms_listbox.yview
-        )
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.rooms_listbox.config(yscrollcommand=scrollbar.set)
+        self.rooms_tree = self._create_record_tree(left_panel, self.select_room)
 
         # Buttons
         btn_frame = ttk.Frame(left_panel)
@@ -570,17 +578,13 @@ class AdventureIDE:
 
         # Room ID
         ttk.Label(right_panel, text="Room ID:").grid(row=0, column=0, sticky=tk.W)
-        self.room_id_var = tk.IntVar()
-        ttk.Label(right_panel, textvariable=self.room_id_var).grid(
-            row=0, column=1, sticky=tk.W
-        )
+        self.room_id_label = ttk.Label(right_panel)
+        self.room_id_label.grid(row=0, column=1, sticky=tk.W)
 
         # Room name
         ttk.Label(right_panel, text="Name:").grid(row=1, column=0, sticky=tk.W, pady=5)
-        self.room_name_var = tk.StringVar()
-        ttk.Entry(right_panel, textvariable=self.room_name_var, width=40).grid(
-            row=1, column=1, pady=5
-        )
+        self.room_name_entry = ttk.Entry(right_panel, width=40)
+        self.room_name_entry.grid(row=1, column=1, pady=5)
 
         # Description
         ttk.Label(right_panel, text="Description:").grid(
@@ -597,53 +601,33 @@ class AdventureIDE:
         exits_frame = ttk.Frame(right_panel)
         exits_frame.grid(row=5, column=0, columnspan=2, sticky=tk.W)
 
-        self.exit_vars = {}
-        directions = [
-            ("North", "north"),
-            ("South", "south"),
-            ("East", "east"),
-            ("West", "west"),
-            ("Up", "up"),
-            ("Down", "down"),
-        ]
-
-        for i, (label, key) in enumerate(directions):
+        # Exit room ids are read straight from the spinboxes on update
+        self.exit_spinboxes = {}
+        for i, (label, key) in enumerate(EXIT_DIRECTIONS):
             row = i // 3
             col = (i % 3) * 2
             ttk.Label(exits_frame, text=f"{label}:").grid(
                 row=row, column=col, sticky=tk.W, padx=5
             )
-            var = tk.IntVar(value=0)
-            ttk.Spinbox(exits_frame, from_=0, to=999, textvariable=var, width=8).grid(
-                row=row, column=col + 1, padx=5
-            )
-            self.exit_vars[key] = var
+            spinbox = ttk.Spinbox(exits_frame, from_=0, to=999, width=8)
+            spinbox.set(0)
+            spinbox.grid(row=row, column=col + 1, padx=5)
+            self.exit_spinboxes[key] = spinbox
 
         # Update button
         ttk.Button(right_panel, text="Update Room", command=self.update_room).grid(
             row=6, column=1, sticky=tk.E, pady=10
         )
 
-    def create_items_tab(self):
+    def create_items_tab(self, frame):
         """Items editor tab"""
-        frame = ttk.Frame(self.notebook, padding="10")
-        self.notebook.add(frame, text="⚔️ Items")
-
         # Left panel - item list
         left_panel = ttk.Frame(frame)
         left_panel.grid(row=0, column=0, sticky=(tk.N, tk.S), padx=5)
 
         ttk.Label(left_panel, text="Items:").pack()
 
-        self.items_listbox = tk.Listbox(left_panel, width=30, height=25)
-        self.items_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        self.items_listbox.bind("<<ListboxSelect>>", self.select_item)
-
-        scrollbar = ttk.Scrollbar(
-            left_panel, orient=tk.VERTICAL, command=self.items_listbox.yview
-        )
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.items_listbox.config(yscrollcommand=scrollbar.set)
+        self.items_tree = self._create_record_tree(left_panel, self.select_item)
 
         # Buttons
         btn_frame = ttk.Frame(left_panel)
@@ -663,19 +647,15 @@ class AdventureIDE:
         # Item properties
         row = 0
         ttk.Label(right_panel, text="Item ID:").grid(row=row, column=0, sticky=tk.W)
-        self.item_id_var = tk.IntVar()
-        ttk.Label(right_panel, textvariable=self.item_id_var).grid(
-            row=row, column=1, sticky=tk.W
-        )
+        self.item_id_label = ttk.Label(right_panel)
+        self.item_id_label.grid(row=row, column=1, sticky=tk.W)
 
         row += 1
         ttk.Label(right_panel, text="Name:").grid(
             row=row, column=0, sticky=tk.W, pady=3
         )
-        self.item_name_var = tk.StringVar()
-        ttk.Entry(right_panel, textvariable=self.item_name_var, width=40).grid(
-            row=row, column=1, pady=3
-        )
+        self.item_name_entry = ttk.Entry(right_panel, width=40)
+        self.item_name_entry.grid(row=row, column=1, pady=3)
 
         row += 1
         ttk.Label(right_panel, text="Description:").grid(
@@ -730,26 +710,15 @@ class AdventureIDE:
             row=row, column=1, sticky=tk.E, pady=10
         )
 
-    def create_monsters_tab(self):
+    def create_monsters_tab(self, frame):
         """Monsters editor tab"""
-        frame = ttk.Frame(self.notebook, padding="10")
-        self.notebook.add(frame, text="👾 Monsters")
-
         # Left panel - monster list
         left_panel = ttk.Frame(frame)
         left_panel.grid(row=0, column=0, sticky=(tk.N, tk.S), padx=5)
 
         ttk.Label(left_panel, text="Monsters/NPCs:").pack()
 
-        self.monsters_listbox = tk.Listbox(left_panel, width=30, height=25)
-        self.monsters_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        self.monsters_listbox.bind("<<ListboxSelect>>", self.select_monster)
-
-        scrollbar = ttk.Scrollbar(
-            left_panel, orient=tk.VERTICAL, command=self.monsters_listbox.yview
-        )
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.monsters_listbox.config(yscrollcommand=scrollbar.set)
+        self.monsters_tree = self._create_record_tree(left_panel, self.select_monster)
 
         # Buttons
         btn_frame = ttk.Frame(left_panel)
@@ -768,19 +737,15 @@ class AdventureIDE:
 
         row = 0
         ttk.Label(right_panel, text="Monster ID:").grid(row=row, column=0, sticky=tk.W)
-        self.monster_id_var = tk.IntVar()
-        ttk.Label(right_panel, textvariable=self.monster_id_var).grid(
-            row=row, column=1, sticky=tk.W
-        )
+        self.monster_id_label = ttk.Label(right_panel)
+        self.monster_id_label.grid(row=row, column=1, sticky=tk.W)
 
         row += 1
         ttk.Label(right_panel, text="Name:").grid(
             row=row, column=0, sticky=tk.W, pady=3
         )
-        self.monster_name_var = tk.StringVar()
-        ttk.Entry(right_panel, textvariable=self.monster_name_var, width=40).grid(
-            row=row, column=1, pady=3
-        )
+        self.monster_name_entry = ttk.Entry(right_panel, width=40)
+        self.monster_name_entry.grid(row=row, column=1, pady=3)
 
         row += 1
         ttk.Label(right_panel, text="Description:").grid(
@@ -849,17 +814,15 @@ class AdventureIDE:
             right_panel, text="Update Monster", command=self.update_monster
         ).grid(row=row, column=1, sticky=tk.E, pady=10)
 
-    def create_preview_tab(self):
+    def create_preview_tab(self, frame):
         """JSON preview tab"""
-        frame = ttk.Frame(self.notebook, padding="10")
-        self.notebook.add(frame, text="📄 JSON")
-
         ttk.Label(frame, text="Adventure JSON:").pack(anchor=tk.W)
 
         self.preview_text = scrolledtext.ScrolledText(
             frame, width=80, height=35, wrap=tk.WORD
         )
         self.preview_text.pack(fill=tk.BOTH, expand=True, pady=5)
+        self._preview_job = None  # Pending _feed_preview callback
 
         btn_frame = ttk.Frame(frame)
         btn_frame.pack(pady=5)
@@ -966,6 +929,7 @@ class AdventureIDE:
         # Initialize game state
         self.game_instance = None
         self.game_running = False
+        self._test_proc = None
 
     # Adventure management methods
     def new_adventure(self):
@@ -1045,40 +1009,103 @@ class AdventureIDE:
         self.current_file = filename
         return self.save_adventure()
 
-    def load_adventure_to_ui(self):
-        """Load adventure data into UI"""
-        # Info tab
-        self.title_var.set(self.adventure.get("title", ""))
-        self.author_var.set(self.adventure.get("author", ""))
-        self.start_room_var.set(self.adventure.get("start_room", 1))
-        self.intro_text.delete("1.0", tk.END)
-        self.intro_text.insert("1.0", self.adventure.get("intro", ""))
+    @staticmethod
+    def _set_entry_text(entry, text):
+        """Replace the text in an Entry"""
+        entry.delete(0, tk.END)
+        entry.insert(0, text)
 
-        # Rooms
-        self.refresh_rooms_list()
+    def _create_record_tree(self, parent, on_select):
+        """Create a scrolled, single-selection list of adventure records"""
+        tree = ttk.Treeview(parent, show="tree", height=25, selectmode="browse")
+        tree.column("#0", width=240)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        tree.bind("<<TreeviewSelect>>", lambda event: self._queue_select(on_select))
 
-        # Items
-        self.refresh_items_list()
+        scrollbar = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=tree.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        tree.config(yscrollcommand=scrollbar.set)
+        return tree
 
-        # Monsters
-        self.refresh_monsters_list()
+    def _queue_select(self, select):
+        """Run a select handler once the event queue is idle
 
-        # Preview
-        self.update_preview()
+        Holding an arrow key fires a selection event per row; only the row
+        selected when the burst ends is loaded into the editor.
+        """
+        if select in self._queued_selects:
+            return
+        self._queued_selects.add(select)
+        self.root.after_idle(self._run_queued_select, select)
+
+    def _run_queued_select(self, select):
+        self._queued_selects.discard(select)
+        select(None)
+
+    @staticmethod
+    def _record_label(record):
+        """Text shown for a room, item or monster in its list"""
+        return f"#{record['id']}: {record['name']}"
+
+    def _fill_record_tree(self, tree, records):
+        """Replace every row of a record list"""
+        tree.delete(*tree.get_children())
+        for record in records:
+            tree.insert("", tk.END, text=self._record_label(record))
+
+    def _append_record(self, tree, records, record):
+        """Add a record and its row, and select the new row"""
+        records.append(record)
+        iid = tree.insert("", tk.END, text=self._record_label(record))
+        tree.selection_set(iid)
+        tree.see(iid)
+
+    @staticmethod
+    def _selected_row(tree):
+        """Return (iid, index) of the selected row, or (None, None)
+
+        Rows are kept in the same order as their records, so the row's
+        position is the record's index.
+        """
+        selection = tree.selection()
+        if not selection:
+            return None, None
+        return selection[0], tree.index(selection[0])
+
+    def load_adventure_to_ui(self):
+        """Load adventure data into the tabs built so far
+
+        Tabs that haven't been opened yet load it when first shown. The
+        rest load in notebook order, so the Info tab is filled before the
+        JSON preview collects from it.
+        """
+        self._adventure_dirty = True
+        for tab, load in self._lazy_tabs:
+            if tab not in self._pending_tabs:
+                load()
+
+    def load_info_to_ui(self):
+        """Load adventure info into the Info tab"""
+        self._set_entry_text(self.title_entry, self.adventure.get("title", ""))
+        self._set_entry_text(self.author_entry, self.adventure.get("author", ""))
+        self.start_room_var.set(self.adventure.get("start_room", 1))
+        self.intro_text.delete("1.0", tk.END)
+        self.intro_text.insert("1.0", self.adventure.get("intro", ""))
 
     def collect_adventure_data(self):
         """Collect data from UI into adventure dict"""
-        self.adventure["title"] = self.title_var.get()
-        self.adventure["author"] = self.author_var.get()
+        if not hasattr(self, "title_entry"):
+            return  # Info tab not built, so nothing can have been edited
+
+        self.adventure["title"] = self.title_entry.get()
+        self.adventure["author"] = self.author_entry.get()
         self.adventure["start_room"] = self.start_room_var.get()
         self.adventure["intro"] = self.intro_text.get("1.0", tk.END).strip()
 
     # Room methods
     def refresh_rooms_list(self):
-        """Refresh the rooms listbox"""
-        self.rooms_listbox.delete(0, tk.END)
-        for room in self.adventure["rooms"]:
-            self.rooms_listbox.insert(tk.END, f"#{room['id']}: {room['name']}")
+        """Refresh the rooms list"""
+        self._fill_record_tree(self.rooms_tree, self.adventure["rooms"])
 
     def add_room(self):
         """Add a new room"""
@@ -1090,56 +1117,53 @@ class AdventureIDE:
             "exits": {},
             "is_dark": False,
         }
-        self.adventure["rooms"].append(room)
-        self.refresh_rooms_list()
-        self.rooms_listbox.selection_set(tk.END)
+        self._append_record(self.rooms_tree, self.adventure["rooms"], room)
         self.select_room(None)
         self.modified = True
 
     def delete_room(self):
         """Delete selected room"""
-        selection = self.rooms_listbox.curselection()
-        if not selection:
+        iid, idx = self._selected_row(self.rooms_tree)
+        if iid is None:
             return
 
         if messagebox.askyesno("Confirm", "Delete this room?"):
-            idx = selection[0]
             del self.adventure["rooms"][idx]
-            self.refresh_rooms_list()
+            self.rooms_tree.delete(iid)
             self.modified = True
 
     def select_room(self, event):
         """Load selected room into editor"""
-        selection = self.rooms_listbox.curselection()
-        if not selection:
+        iid, idx = self._selected_row(self.rooms_tree)
+        if iid is None:
             return
 
-        room = self.adventure["rooms"][selection[0]]
-        self.room_id_var.set(room["id"])
-        self.room_name_var.set(room["name"])
+        room = self.adventure["rooms"][idx]
+        self.room_id_label.config(text=room["id"])
+        self._set_entry_text(self.room_name_entry, room["name"])
         self.room_desc.delete("1.0", tk.END)
         self.room_desc.insert("1.0", room["description"])
 
-        for direction, var in self.exit_vars.items():
-            var.set(room["exits"].get(direction, 0))
+        for direction, spinbox in self.exit_spinboxes.items():
+            spinbox.set(room["exits"].get(direction, 0))
 
     def update_room(self):
         """Update current room from editor"""
-        selection = self.rooms_listbox.curselection()
-        if not selection:
+        iid, idx = self._selected_row(self.rooms_tree)
+        if iid is None:
             return
 
-        room = self.adventure["rooms"][selection[0]]
-        room["name"] = self.room_name_var.get()
+        room = self.adventure["rooms"][idx]
+        room["name"] = self.room_name_entry.get()
         room["description"] = self.room_desc.get("1.0", tk.END).strip()
 
         room["exits"] = {}
-        for direction, var in self.exit_vars.items():
-            if var.get() > 0:
-                room["exits"][direction] = var.get()
+        for direction, spinbox in self.exit_spinboxes.items():
+            target = int(spinbox.get() or 0)
+            if target > 0:
+                room["exits"][direction] = target
 
-        self.refresh_rooms_list()
-        self.rooms_listbox.selection_set(selection[0])
+        self.rooms_tree.item(iid, text=self._record_label(room))
         self.modified = True
         self.update_status("Room updated")
 
@@ -1151,10 +1175,8 @@ class AdventureIDE:
 
     # Item methods
     def refresh_items_list(self):
-        """Refresh items listbox"""
-        self.items_listbox.delete(0, tk.END)
-        for item in self.adventure["items"]:
-            self.items_listbox.insert(tk.END, f"#{item['id']}: {item['name']}")
+        """Refresh items list"""
+        self._fill_record_tree(self.items_tree, self.adventure["items"])
 
     def add_item(self):
         """Add a new item"""
@@ -1170,33 +1192,30 @@ class AdventureIDE:
             "is_takeable": True,
             "location": 1,
         }
-        self.adventure["items"].append(item)
-        self.refresh_items_list()
-        self.items_listbox.selection_set(tk.END)
+        self._append_record(self.items_tree, self.adventure["items"], item)
         self.select_item(None)
         self.modified = True
 
     def delete_item(self):
         """Delete selected item"""
-        selection = self.items_listbox.curselection()
-        if not selection:
+        iid, idx = self._selected_row(self.items_tree)
+        if iid is None:
             return
 
         if messagebox.askyesno("Confirm", "Delete this item?"):
-            idx = selection[0]
             del self.adventure["items"][idx]
-            self.refresh_items_list()
+            self.items_tree.delete(iid)
             self.modified = True
 
     def select_item(self, event):
         """Load selected item into editor"""
-        selection = self.items_listbox.curselection()
-        if not selection:
+        iid, idx = self._selected_row(self.items_tree)
+        if iid is None:
             return
 
-        item = self.adventure["items"][selection[0]]
-        self.item_id_var.set(item["id"])
-        self.item_name_var.set(item["name"])
+        item = self.adventure["items"][idx]
+        self.item_id_label.config(text=item["id"])
+        self._set_entry_text(self.item_name_entry, item["name"])
         self.item_desc.delete("1.0", tk.END)
         self.item_desc.insert("1.0", item["description"])
         self.item_weight_var.set(item.get("weight", 1))
@@ -1207,12 +1226,12 @@ class AdventureIDE:
 
     def update_item(self):
         """Update current item"""
-        selection = self.items_listbox.curselection()
-        if not selection:
+        iid, idx = self._selected_row(self.items_tree)
+        if iid is None:
             return
 
-        item = self.adventure["items"][selection[0]]
-        item["name"] = self.item_name_var.get()
+        item = self.adventure["items"][idx]
+        item["name"] = self.item_name_entry.get()
         item["description"] = self.item_desc.get("1.0", tk.END).strip()
         item["weight"] = self.item_weight_var.get()
         item["value"] = self.item_value_var.get()
@@ -1220,17 +1239,14 @@ class AdventureIDE:
         item["is_weapon"] = self.item_is_weapon_var.get()
         item["is_takeable"] = self.item_is_takeable_var.get()
 
-        self.refresh_items_list()
-        self.items_listbox.selection_set(selection[0])
+        self.items_tree.item(iid, text=self._record_label(item))
         self.modified = True
         self.update_status("Item updated")
 
     # Monster methods
     def refresh_monsters_list(self):
-        """Refresh monsters listbox"""
-        self.monsters_listbox.delete(0, tk.END)
-        for monster in self.adventure["monsters"]:
-            self.monsters_listbox.insert(tk.END, f"#{monster['id']}: {monster['name']}")
+        """Refresh monsters list"""
+        self._fill_record_tree(self.monsters_tree, self.adventure["monsters"])
 
     def add_monster(self):
         """Add a new monster"""
@@ -1246,33 +1262,30 @@ class AdventureIDE:
             "courage": 100,
             "gold": 0,
         }
-        self.adventure["monsters"].append(monster)
-        self.refresh_monsters_list()
-        self.monsters_listbox.selection_set(tk.END)
+        self._append_record(self.monsters_tree, self.adventure["monsters"], monster)
         self.select_monster(None)
         self.modified = True
 
     def delete_monster(self):
         """Delete selected monster"""
-        selection = self.monsters_listbox.curselection()
-        if not selection:
+        iid, idx = self._selected_row(self.monsters_tree)
+        if iid is None:
             return
 
         if messagebox.askyesno("Confirm", "Delete this monster?"):
-            idx = selection[0]
             del self.adventure["monsters"][idx]
-            self.refresh_monsters_list()
+            self.monsters_tree.delete(iid)
             self.modified = True
 
     def select_monster(self, event):
         """Load selected monster into editor"""
-        selection = self.monsters_listbox.curselection()
-        if not selection:
+        iid, idx = self._selected_row(self.monsters_tree)
+        if iid is None:
             return
 
-        monster = self.adventure["monsters"][selection[0]]
-        self.monster_id_var.set(monster["id"])
-        self.monster_name_var.set(monster["name"])
+        monster = self.adventure["monsters"][idx]
+        self.monster_id_label.config(text=monster["id"])
+        self._set_entry_text(self.monster_name_entry, monster["name"])
         self.monster_desc.delete("1.0", tk.END)
         self.monster_desc.insert("1.0", monster["description"])
         self.monster_room_var.set(monster.get("room_id", 1))
@@ -1283,12 +1296,12 @@ class AdventureIDE:
 
     def update_monster(self):
         """Update current monster"""
-        selection = self.monsters_listbox.curselection()
-        if not selection:
+        iid, idx = self._selected_row(self.monsters_tree)
+        if iid is None:
             return
 
-        monster = self.adventure["monsters"][selection[0]]
-        monster["name"] = self.monster_name_var.get()
+        monster = self.adventure["monsters"][idx]
+        monster["name"] = self.monster_name_entry.get()
         monster["description"] = self.monster_desc.get("1.0", tk.END).strip()
         monster["room_id"] = self.monster_room_var.get()
         monster["hardiness"] = self.monster_hardiness_var.get()
@@ -1296,18 +1309,47 @@ class AdventureIDE:
         monster["friendliness"] = self.monster_friendliness_var.get()
         monster["gold"] = self.monster_gold_var.get()
 
-        self.refresh_monsters_list()
-        self.monsters_listbox.selection_set(selection[0])
+        self.monsters_tree.item(iid, text=self._record_label(monster))
         self.modified = True
         self.update_status("Monster updated")
 
     # Preview methods
     def update_preview(self):
-        """Update JSON preview"""
+        """Update JSON preview
+
+        The JSON goes in a chunk at a time from idle callbacks, so a large
+        adventure doesn't freeze the window while the preview fills.
+        """
         self.collect_adventure_data()
-        json_text = json.dumps(self.adventure, indent=2)
+        # Info tab fields are read live, so unsaved typing there counts too
+        info = tuple(
+            self.adventure[key] for key in ("title", "author", "start_room", "intro")
+        )
+        if (
+            not self._adventure_dirty
+            and self._preview_cache is not None
+            and self._preview_cache[0] == info
+        ):
+            return
+        json_text = json.dumps(self.adventure, indent=2, ensure_ascii=False)
+        self._preview_cache = (info, json_text)
+        self._adventure_dirty = False
+
+        if self._preview_job is not None:
+            self.root.after_cancel(self._preview_job)
+        self.preview_text.config(state=tk.NORMAL)
         self.preview_text.delete("1.0", tk.END)
-        self.preview_text.insert("1.0", json_text)
+        self._feed_preview(json_text, 0)
+
+    def _feed_preview(self, json_text, start):
+        """Insert the next chunk of preview JSON and schedule the rest"""
+        end = start + PREVIEW_CHUNK_SIZE
+        self.preview_text.insert(tk.END, json_text[start:end])
+        if end < len(json_text):
+            self._preview_job = self.root.after_idle(self._feed_preview, json_text, end)
+        else:
+            self._preview_job = None
+            self.preview_text.config(state=tk.DISABLED)
 
     def copy_preview(self):
         """Copy preview to clipboard"""
@@ -1326,11 +1368,84 @@ class AdventureIDE:
             with open(temp_file, "w") as f:
                 json.dump(self.adventure, f, indent=2)
 
-            # Launch game
-            subprocess.Popen(["./play_adventure.sh", "_temp_test.json"])
-            self.update_status("Testing adventure...")
+            # Run the engine in its own process, talking to it through the
+            # Play tab's console so the IDE stays responsive
+            self._stop_test_process()
+            self.game_running = False
+            self._test_proc = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-u",
+                    "-m",
+                    "src.acs.core.engine",
+                    os.path.abspath(temp_file),
+                ],
+                cwd=PROJECT_ROOT,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                env={**os.environ, "PYTHONIOENCODING": "utf-8"},
+            )
         except Exception as e:
             messagebox.showerror("Error", f"Failed to test:\n{e}")
+            return
+
+        # os.read returns whatever has arrived, so prompts without a
+        # trailing newline show up straight away
+        output = queue.SimpleQueue()
+        stdout = self._test_proc.stdout
+        threading.Thread(
+            target=self._read_test_output, args=(stdout, output), daemon=True
+        ).start()
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+        self.clear_game_output()
+        self.notebook.select(0)
+        self.command_entry.focus()
+        self.root.after(
+            TEST_OUTPUT_POLL_MS, self._pump_test_output, self._test_proc, output, decoder
+        )
+        self.update_status("Testing adventure...")
+
+    @staticmethod
+    def _read_test_output(stream, output):
+        """Forward a test run's raw output to the IDE, then signal its end"""
+        for chunk in iter(lambda: os.read(stream.fileno(), 4096), b""):
+            output.put(chunk)
+        output.put(None)
+
+    def _pump_test_output(self, proc, output, decoder):
+        """Copy what a test run has printed so far into the play console"""
+        parts = []
+        finished = False
+        while not output.empty():
+            chunk = output.get()
+            if chunk is None:
+                finished = True
+                break
+            parts.append(decoder.decode(chunk))
+        if parts:
+            self._append_game_output("".join(parts))
+
+        if not finished:
+            self.root.after(
+                TEST_OUTPUT_POLL_MS, self._pump_test_output, proc, output, decoder
+            )
+            return
+
+        proc.wait()
+        proc.stdout.close()
+        if proc is self._test_proc:
+            self._test_proc = None
+            self.print_game("\n" + "=" * 60)
+            self.print_game("Test run ended")
+            self.update_status("Test run ended")
+
+    def _stop_test_process(self):
+        """End a test run that is still going"""
+        proc, self._test_proc = self._test_proc, None
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
 
     def validate_adventure(self):
         """Validate adventure data"""
@@ -1414,8 +1529,12 @@ F5 - Test Adventure
     # Game play methods
     def print_game(self, text):
         """Print text to game output"""
+        self._append_game_output(text + "\n")
+
+    def _append_game_output(self, text):
+        """Add raw text to the end of the game output"""
         self.game_output.config(state=tk.NORMAL)
-        self.game_output.insert(tk.END, text + "\n")
+        self.game_output.insert(tk.END, text)
         self.game_output.see(tk.END)
         self.game_output.config(state=tk.DISABLED)
 
@@ -1469,15 +1588,9 @@ F5 - Test Adventure
                 json.dump(self.adventure, f, indent=2)
 
             # Import and start game engine
-            engine_path = (
-                Path(__file__).parent.parent.parent.parent / "acs_engine_enhanced.py"
-            )
-            spec = importlib.util.spec_from_file_location(
-                "acs_engine_enhanced", engine_path
-            )
-            acs_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(acs_module)
+            acs_module = self._get_engine(PROJECT_ROOT / "acs_engine_enhanced.py")
 
+            self._stop_test_process()
             self.clear_game_output()
             self.game_instance = acs_module.EnhancedAdventureGame(temp_file)
             self.game_instance.load_adventure()
@@ -1513,6 +1626,31 @@ F5 - Test Adventure
             messagebox.showerror("Error", f"Failed to start game:\n{e}")
             self.game_running = False
 
+    def _send_test_command(self):
+        """Pass the command line to a running test process"""
+        command = self.command_entry.get()
+        self.command_entry.delete(0, tk.END)
+        self._append_game_output(command + "\n")
+        try:
+            self._test_proc.stdin.write(command.encode("utf-8") + b"\n")
+            self._test_proc.stdin.flush()
+        except OSError:
+            # The engine has exited; the output pump reports it
+            pass
+
+    def _get_engine(self, path):
+        """Return the engine module at path, loading it only if it changed"""
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._engine_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        spec = importlib.util.spec_from_file_location("acs_engine_enhanced", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        self._engine_cache[path] = (mtime, module)
+        return module
+
     def restart_game(self):
         """Restart the current game"""
         if self.game_running:
@@ -1522,6 +1660,10 @@ F5 - Test Adventure
 
     def send_command(self):
         """Send command to game engine"""
+        if self._test_proc is not None:
+            self._send_test_command()
+            return
+
         if not self.game_running:
             messagebox.showinfo(
                 "No Game", "Please start the game first using '▶ Start Game'"
@@ -1581,22 +1723,20 @@ F5 - Test Adventure
         if theme_name in self.themes:
             self.current_theme = theme_name
             self.colors = self.themes[theme_name]
-            self.setup_styles()
+            self._configure_colors(self._style)
             self.refresh_all_widgets()
             self.update_status(f"Theme changed to: {theme_name}")
 
     def change_font_family(self, font_family):
         """Change the UI font family"""
         self.current_font_family = font_family
-        self.setup_styles()
-        self.refresh_all_widgets()
+        self._configure_fonts(self._style)
         self.update_status(f"Font changed to: {font_family}")
 
     def change_font_size(self, font_size):
         """Change the UI font size"""
         self.current_font_size = font_size
-        self.setup_styles()
-        self.refresh_all_widgets()
+        self._configure_fonts(self._style)
         self.update_status(f"Font size changed to: {font_size}pt")
 
     def change_editor_font(self, font_family):
@@ -1623,37 +1763,26 @@ F5 - Test Adventure
 
     def refresh_all_widgets(self):
         """Refresh all widgets to apply new theme"""
+        c = self.colors
+        fg, text_bg = c["fg"], c["text_bg"]
+
         # Re-setup the UI with new colors
-        self.root.configure(bg=self.colors["bg"])
+        self.root.configure(bg=c["bg"])
 
         # Update status bar
         if hasattr(self, "status_bar"):
-            self.status_bar.config(bg=self.colors["panel"], fg=self.colors["fg"])
+            self.status_bar.config(bg=c["panel"], fg=fg)
 
         # Update all text widgets with new colors
-        if hasattr(self, "intro_text"):
-            self.intro_text.config(
-                bg=self.colors["text_bg"],
-                fg=self.colors["fg"],
-                insertbackground=self.colors["fg"],
-            )
-
-        if hasattr(self, "description_text"):
-            self.description_text.config(
-                bg=self.colors["text_bg"],
-                fg=self.colors["fg"],
-                insertbackground=self.colors["fg"],
-            )
+        for name in ("intro_text", "description_text", "game_input"):
+            if hasattr(self, name):
+                getattr(self, name).config(bg=text_bg, fg=fg, insertbackground=fg)
 
         if hasattr(self, "game_output"):
-            self.game_output.config(bg=self.colors["text_bg"], fg=self.colors["fg"])
+            self.game_output.config(bg=text_bg, fg=fg)
 
-        if hasattr(self, "game_input"):
-            self.game_input.config(
-                bg=self.colors["text_bg"],
-                fg=self.colors["fg"],
-                insertbackground=self.colors["fg"],
-            )
+        for menu, bg_key in self._menus:
+            menu.config(bg=c[bg_key], fg=fg, activebackground=c["accent"])
 
     def reset_view_settings(self):
         """Reset theme and font to defaults"""
@@ -1675,6 +1804,7 @@ F5 - Test Adventure
         ):
             return
 
+        self._stop_test_process()
         self.root.quit()
 
 
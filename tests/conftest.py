@@ -3,6 +3,8 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 SRC_PATH = PROJECT_ROOT / "src"
 
@@ -10,3 +12,9 @@ for path in (PROJECT_ROOT, SRC_PATH):
     path_str = str(path)
     if path_str not in sys.path:
         sys.path.insert(0, path_str)
+
+
+@pytest.fixture(autouse=True)
+def _adventure_cache_dir(tmp_path, monkeypatch):
+    """Keep the engine's adventure cache out of the user's cache directory"""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
@@ -0,0 +1,562 @@
+"""Tests for the core adventure engine"""
+
+import json
+
+import pytest
+
+from src.acs.core.engine import (
+    AdventureGame,
+    Item,
+    ItemType,
+    MonsterStatus,
+    NamedBag,
+    adventure_cache_file,
+    roll_dice,
+)
+
+ADVENTURE = {
+    "title": "Test Adventure",
+    "intro": "Welcome.",
+    "start_room": 1,
+    "rooms": [
+        {"id": 1, "name": "Hall", "description": "A hall.", "exits": {"north": 2}},
+        {"id": 2, "name": "Cave", "description": "A cave.", "exits": {"south": 1}},
+    ],
+    "items": [
+        {"id": 2, "name": "Lamp", "description": "Bright.", "location": 1},
+        {"id": 1, "name": "Rusty Sword", "description": "Old.", "location": 1},
+        {"id": 3, "name": "Statue", "description": "Heavy.", "location": 2},
+    ],
+    "monsters": [
+        {"id": 1, "name": "Goblin", "description": "Ugly.", "room_id": 2},
+        {
+            "id": 2,
+            "name": "Old Wizard",
+            "description": "Wise.",
+            "room_id": 1,
+            "friendliness": "friendly",
+        },
+    ],
+}
+
+
+@pytest.fixture
+def game(tmp_path):
+    path = tmp_path / "adventure.json"
+    path.write_text(json.dumps(ADVENTURE))
+    game = AdventureGame(str(path))
+    game.load_adventure()
+    return game
+
+
+def _ids(objects):
+    return [obj.id for obj in objects]
+
+
+def test_room_index_tracks_item_moves(game):
+    assert _ids(game.get_items_in_room(1)) == [1, 2]
+
+    game.get_item("lamp")
+    assert _ids(game.get_items_in_room(1)) == [1]
+    assert game.player.inventory == [game.items[2]]
+
+    game.player.current_room = 2
+    game.drop_item("lamp")
+    assert _ids(game.get_items_in_room(2)) == [2, 3]
+    assert _ids(game.get_items_in_room(1)) == [1]
+
+
+def test_room_index_skips_dead_and_recruited_monsters(game):
+    assert _ids(game.get_monsters_in_room(2)) == [1]
+    game._kill_monster(game.monsters[1])
+    assert game.monsters[1].is_dead
+    assert game.get_monsters_in_room(2) == []
+
+    # Recruited companions are parked outside the map
+    game._move_monster(game.monsters[2], -999)
+    assert game.get_monsters_in_room(1) == []
+
+
+def test_resolve_matches_casefolded_names(game):
+    assert game.items[1].name_cf == "rusty sword"
+    items = game.get_items_in_room(1)
+    assert game._resolve("SWORD", items) is game.items[1]
+    assert game._resolve("wand", items) is None
+    assert game._resolve("a", items) is None
+    assert game._resolve("rusty sw", items) is game.items[1]
+    assert game._resolve("wizard", game.get_monsters_in_room(1)) is game.monsters[2]
+
+
+def test_weapon_damage_stays_within_dice_range(game):
+    sword = game.items[1]
+    sword.is_weapon = True
+    sword.weapon_dice, sword.weapon_sides = 3, 4
+    rolls = {sword.get_damage() for _ in range(500)}
+    assert rolls <= set(range(3, 13))
+    assert min(rolls) < 6 and max(rolls) > 9
+
+    sword.weapon_dice = 1
+    assert {sword.get_damage() for _ in range(200)} <= set(range(1, 5))
+    assert game.items[2].get_damage() == 0
+
+
+def test_roll_dice_totals():
+    assert {roll_dice(1, 1), roll_dice(4, 1)} == {1, 4}
+    assert roll_dice(0, 6) == 0
+    assert {roll_dice(2, 6) for _ in range(300)} <= set(range(2, 13))
+
+
+def test_entities_are_slotted(game):
+    for obj in (game.items[1], game.monsters[1], game.rooms[1], game.player):
+        assert not hasattr(obj, "__dict__")
+    assert game.items[1].consumable is False and game.items[1].heal_amount == 0
+
+
+def test_adventure_cache_is_written_and_reused(tmp_path):
+    import os
+
+    path = tmp_path / "adventure.json"
+    path.write_text(json.dumps(ADVENTURE))
+    cache = adventure_cache_file(str(path))
+    assert cache.startswith(str(tmp_path / "cache"))
+
+    AdventureGame(str(path)).load_adventure()
+    assert os.path.exists(cache)
+    assert sorted(os.listdir(tmp_path)) == ["adventure.json", "cache"]
+
+    # A newer cache wins over the JSON text
+    stamp = os.path.getmtime(path)
+    path.write_text("{not json")
+    os.utime(path, (stamp - 10, stamp - 10))
+    cached = AdventureGame(str(path))
+    cached.load_adventure()
+    assert cached.items[1].name == "Rusty Sword"
+
+    # Editing the JSON invalidates the cache
+    renamed = dict(ADVENTURE, title="Renamed")
+    path.write_text(json.dumps(renamed))
+    os.utime(path, (stamp + 10, stamp + 10))
+    fresh = AdventureGame(str(path))
+    fresh.load_adventure()
+    assert fresh.adventure_title == "Renamed"
+
+
+def test_ide_scratch_adventures_are_not_cached(tmp_path):
+    path = tmp_path / "_temp_play.json"
+    path.write_text(json.dumps(ADVENTURE))
+    assert adventure_cache_file(str(path)) is None
+
+    AdventureGame(str(path)).load_adventure()
+    assert not (tmp_path / "cache").exists()
+
+
+def test_load_fills_defaults_for_missing_fields(game):
+    lamp = game.items[2]
+    assert (lamp.item_type, lamp.weight, lamp.weapon_sides, lamp.is_takeable) == (
+        ItemType.NORMAL,
+        1,
+        6,
+        True,
+    )
+    goblin = game.monsters[1]
+    assert goblin.friendliness is MonsterStatus.NEUTRAL
+    assert (goblin.hardiness, goblin.current_health, goblin.weapon_id) == (10, 10, None)
+    assert game.monsters[2].friendliness is MonsterStatus.FRIENDLY
+
+
+def test_unknown_enum_values_fall_back_to_defaults(tmp_path):
+    data = dict(
+        ADVENTURE,
+        items=[{"id": 1, "name": "Orb", "description": "?", "type": "mystic"}],
+        monsters=[{"id": 1, "name": "Imp", "description": "?", "friendliness": "odd"}],
+    )
+    path = tmp_path / "odd.json"
+    path.write_text(json.dumps(data))
+    game = AdventureGame(str(path))
+    game.load_adventure()
+    assert game.items[1].item_type is ItemType.NORMAL
+    assert game.monsters[1].friendliness is MonsterStatus.NEUTRAL
+
+
+def test_look_writes_room_in_one_block(game, capsys):
+    game.environment = None  # Time and weather text varies
+    game.look()
+    assert capsys.readouterr().out == (
+        "\nHall\n----\nA hall.\n\nObvious exits: north\n"
+        "\nYou see:\n  - Rusty Sword\n  - Lamp\n"
+        "\nPresent:\n  - Old Wizard (friendly)\n"
+    )
+
+
+def test_room_exits_accept_case_and_abbreviations(game):
+    hall = game.rooms[1]
+    assert hall.get_exit("north") == 2
+    assert hall.get_exit("North") == 2
+    assert hall.get_exit("n") == 2
+    assert hall.get_exit("s") is None
+    assert hall.get_exit("xyzzy") is None
+
+
+def test_party_display_and_gather(game, capsys):
+    game.recruit_companion("wizard")
+    wizard = game.companions[0]
+    wizard.tell_to_wait(1)
+    capsys.readouterr()
+
+    game.show_party()
+    out = capsys.readouterr().out
+    assert "Old Wizard - fighter (ALIVE) (WAITING)" in out
+    assert f"Stance: {wizard.stance.value}" in out
+
+    game.gather_party()
+    assert not wizard.is_waiting
+
+
+def test_killed_monster_leaves_room_but_stays_loaded(game):
+    game.player.current_room = 2
+    game.monsters[1].current_health = 1
+    game.attack("goblin")
+    assert game.get_monsters_in_room(2) == []
+    assert game.monsters[1].is_dead
+
+    game._rebuild_room_index()
+    assert game.get_monsters_in_room(2) == []
+
+
+def test_resolve_casefolds_unicode_names(game):
+    street = Item(9, "Straße Sign", "A sign.", ItemType.NORMAL, 1, 0)
+    assert game._resolve("STRASSE", [street]) is street
+
+
+def test_party_orders_dispatch_on_keywords(game, capsys):
+    game.recruit_companion("wizard")
+    wizard = game.companions[0]
+
+    game.party_command("wizard", "please be defensive!")
+    assert wizard.stance.value == "defensive"
+    game.party_command("wizard", "stay here")
+    assert wizard.is_waiting
+    game.party_command("wizard", "come along")
+    assert not wizard.is_waiting
+    game.party_command("wizard", "dance")
+    assert capsys.readouterr().out.endswith("Old Wizard nods in understanding.\n")
+
+
+def test_eating_consumable_heals_and_uses_it_up(game, capsys):
+    lamp = game.items[2]
+    lamp.consumable, lamp.heal_amount = True, 5
+    game.get_item("lamp")
+    game.player.current_health = 4
+
+    game.process_command("eat lamp")
+    assert game.player.current_health == 9
+    assert game.player.inventory == []
+    assert "Health restored by 5." in capsys.readouterr().out
+
+
+def test_adventure_seed_makes_combat_repeatable(tmp_path):
+    path = tmp_path / "seeded.json"
+    path.write_text(json.dumps(dict(ADVENTURE, seed=42)))
+
+    def fight():
+        game = AdventureGame(str(path))
+        game.load_adventure()
+        game.player.current_room = 2
+        for _ in range(3):
+            game.attack("goblin")
+        return game.monsters[1].current_health, game.player.current_health
+
+    assert fight() == fight()
+
+
+def test_room_contents_come_out_in_section_order(game):
+    from acs.systems.environment import InspectableObject
+
+    game.environment.add_room_object(
+        1, InspectableObject("mural", "Mural", "A faded mural.", "Dragons.")
+    )
+    assert list(game._enumerate_room_contents(1)) == [
+        (0, "A faded mural."),
+        (1, "Rusty Sword"),
+        (1, "Lamp"),
+        (2, "Old Wizard (friendly)"),
+    ]
+
+
+def test_parsed_actions_dispatch_through_table(game, capsys):
+    assert game._action_table["eat"] == game._action_table["drink"]
+
+    game._action_table["drink"]({"action": "drink", "object": "potion"})
+    assert capsys.readouterr().out == "You don't have any potion.\n"
+
+    game.process_command("quit")
+    assert game.game_over
+
+
+def test_simple_parser_dispatches_verbs_and_directions(game, capsys):
+    game.use_enhanced_parser = False
+    game.command_system = None
+
+    game.process_command("take lamp")
+    assert game.player.inventory == [game.items[2]]
+    game.process_command("n")
+    assert game.player.current_room == 2
+    game.process_command("fight")
+    game.process_command("xyzzy")
+    out = capsys.readouterr().out
+    assert "Attack what?" in out
+    assert "I don't understand 'xyzzy'" in out
+
+    game.process_command("look statue")
+    out = capsys.readouterr().out
+    assert "Cave" in out and "You examine" not in out
+    game.process_command("northeast")
+    assert "I don't understand 'northeast'" in capsys.readouterr().out
+
+    game.process_command("q")
+    assert game.game_over
+
+
+def test_room_monster_list_is_reused_until_it_changes(game):
+    hall = game.get_monsters_in_room(1)
+    assert game.get_monsters_in_room(1) is hall
+
+    game._move_monster(game.monsters[1], 1)
+    moved = game.get_monsters_in_room(1)
+    assert moved is not hall
+    assert _ids(moved) == [1, 2]
+    assert game.get_monsters_in_room(2) == []
+
+    game._kill_monster(game.monsters[2])
+    assert _ids(game.get_monsters_in_room(1)) == [1]
+
+
+def test_named_bag_finds_by_word_and_substring():
+    sword = Item(1, "Rusty Sword", "", ItemType.WEAPON, 1, 0)
+    fish = Item(2, "Swordfish", "", ItemType.EDIBLE, 1, 0)
+    bag = NamedBag([fish, sword])
+
+    assert bag.find("SWORD") is sword  # whole word wins over substring
+    assert bag.find("rusty sword") is sword
+    assert bag.find("swo") is fish  # partial words scan in order
+    assert bag.find("lamp") is None
+    assert bag.find("fish") is None  # no matches inside a word
+
+    bag.remove(sword)
+    assert bag.find("sword") is fish
+    bag.append(sword)
+    assert bag.find("rusty") is sword
+    bag.clear()
+    assert bag.find("sword") is None
+
+
+def test_bag_and_resolve_share_the_name_rule(game):
+    hat = Item(1, "Old Wizard Hat", "", ItemType.ARMOR, 1, 0)
+    fish = Item(2, "Swordfish", "", ItemType.EDIBLE, 1, 0)
+    sword = Item(3, "Rusty Sword", "", ItemType.WEAPON, 1, 0)
+    bag = NamedBag([hat, fish, sword])
+
+    for lookup in (bag.find, lambda name: game._resolve(name, bag)):
+        assert lookup("wizard hat") is hat  # whole words, in order
+        assert lookup("hat wizard") is None
+        assert lookup("izard hat") is None  # not a word, not a prefix
+        assert lookup("old wizard") is hat
+        assert lookup("hat") is hat
+        assert lookup("sword") is sword  # a whole word beats an earlier prefix
+        assert lookup("sw") is fish
+
+
+def test_punctuated_and_multi_word_names_resolve(game):
+    crystal = Item(1, "Time Crystal (Victorian)", "", ItemType.TREASURE, 1, 0)
+    shades = Item(2, "Peril-Sensitive Sunglasses", "", ItemType.NORMAL, 1, 0)
+    drink = Item(3, "Pan Galactic Gargle Blaster", "", ItemType.DRINKABLE, 1, 0)
+    bag = NamedBag([crystal, shades, drink])
+
+    for lookup in (bag.find, lambda name: game._resolve(name, bag)):
+        assert lookup("victorian") is crystal
+        assert lookup("(Victorian)") is crystal
+        assert lookup("crystal victorian") is crystal
+        assert lookup("sensitive sunglasses") is shades
+        assert lookup("peril sensitive") is shades
+        assert lookup("gargle blaster") is drink
+        assert lookup("GALACTIC GARGLE") is drink
+        assert lookup("pan blaster") is None
+        assert lookup("p") is shades  # one letter only matches a name start
+
+
+def test_merchant_trade_and_equipment_use_declared_fields(tmp_path, capsys):
+    data = dict(
+        ADVENTURE,
+        items=ADVENTURE["items"]
+        + [{"id": 4, "name": "Shield", "description": "Round.", "value": 30,
+            "location": 1, "equippable": True}],
+        monsters=[
+            {"id": 1, "name": "Trader", "description": "Shrewd.", "room_id": 1,
+             "is_merchant": True}
+        ],
+    )
+    path = tmp_path / "market.json"
+    path.write_text(json.dumps(data))
+    game = AdventureGame(str(path))
+    game.load_adventure()
+    trader = game.monsters[1]
+    assert trader.is_merchant and trader.inventory == []
+
+    game.get_item("shield")
+    # The enhanced parser folds buy/sell into trade, so call them directly
+    game._action_table["sell"]({"action": "sell", "target": "shield"})
+    assert trader.inventory == [game.items[4]]
+    assert game.player.gold == 215
+
+    game._action_table["buy"]({"action": "buy", "target": "shield"})
+    assert game.player.gold == 185
+    game.process_command("equip shield")
+    assert game.player.equipped == {4: game.items[4]}
+    game.process_command("unequip SHIELD")
+    assert game.player.equipped == {}
+    assert "You unequip the Shield." in capsys.readouterr().out
+
+
+def test_like_named_items_are_equipped_separately(game, capsys):
+    rings = [Item(i, "Ring", "", ItemType.NORMAL, 1, 0, equippable=True) for i in (7, 8)]
+    game.player.inventory.extend(rings)
+
+    for _ in range(3):
+        game._action_equip({"action": "equip", "target": "ring"})
+    assert game.player.equipped == {7: rings[0], 8: rings[1]}
+    assert "You already have the Ring equipped." in capsys.readouterr().out
+
+    game._action_equip({"action": "unequip", "target": "ring"})
+    game._action_equip({"action": "unequip", "target": "ring"})
+    assert game.player.equipped == {}
+
+
+def test_enhanced_trading_npc_is_a_merchant_with_item_stock(tmp_path):
+    from acs_engine_enhanced import EnhancedAdventureGame
+
+    data = dict(
+        ADVENTURE,
+        monsters=[
+            {"id": 1, "name": "Trader", "description": "Shrewd.", "room_id": 1,
+             "can_trade": True, "inventory": [3, 99]}
+        ],
+    )
+    path = tmp_path / "market.json"
+    path.write_text(json.dumps(data))
+    game = EnhancedAdventureGame(str(path))
+    game.load_adventure()
+    trader = game.monsters[1]
+    assert trader.is_merchant
+    assert trader.inventory == [game.items[3]]
+    assert trader.inventory.find("statue") is game.items[3]
+
+    game._action_table["buy"]({"action": "buy", "target": "statue"})
+    assert game.player.inventory == [game.items[3]]
+    assert trader.inventory == []
+
+
+def test_room_merchant_is_cached_until_monsters_change(game):
+    goblin, wizard = game.monsters[1], game.monsters[2]
+    assert game.get_merchant_in_room(1) is None
+
+    wizard.is_merchant = True
+    assert game.get_merchant_in_room(1) is None  # still cached
+    game._rebuild_room_index()
+    assert game.get_merchant_in_room(1) is wizard
+
+    goblin.is_merchant = True
+    game._move_monster(goblin, 1)
+    assert game.get_merchant_in_room(1) is goblin
+    game._move_monster(goblin, 2)
+    assert game.get_merchant_in_room(1) is wizard
+    assert game.get_merchant_in_room(2) is goblin
+
+    game._kill_monster(wizard)
+    assert game.get_merchant_in_room(1) is None
+
+
+def test_command_output_is_written_in_one_call(game, monkeypatch):
+    import sys
+
+    class Recorder:
+        def __init__(self):
+            self.writes = []
+
+        def write(self, text):
+            self.writes.append(text)
+
+        def flush(self):
+            pass
+
+    out = Recorder()
+    monkeypatch.setattr(sys, "stdout", out)
+    game.process_command("look")
+    game.process_command("inventory")
+    assert len(out.writes) == 2
+    assert "Hall" in out.writes[0]
+
+
+def test_open_and_close_remember_feature_state(tmp_path, capsys):
+    rooms = [dict(ADVENTURE["rooms"][0], features=["Oak Door"]), ADVENTURE["rooms"][1]]
+    path = tmp_path / "door.json"
+    path.write_text(json.dumps(dict(ADVENTURE, rooms=rooms)))
+    game = AdventureGame(str(path))
+    game.load_adventure()
+    door = game.rooms[1].features["oak door"]
+    assert door == {"state": "closed"}
+    capsys.readouterr()
+
+    open_close = game._action_table["open"]
+    open_close({"action": "open", "target": "oak"})
+    assert door["state"] == "open"
+    open_close({"action": "open", "target": "Oak Door"})
+    open_close({"action": "close", "target": "oak door"})
+    assert door["state"] == "closed"
+    open_close({"action": "open", "target": "window"})
+    open_close({"action": "close", "target": ""})
+    assert capsys.readouterr().out.splitlines() == [
+        "You open the oak.",
+        "The Oak Door is already open.",
+        "You close the oak door.",
+        "You don't see any window to open.",
+        "Close what?",
+    ]
+
+
+def test_companions_are_found_by_cached_name(game, capsys):
+    game.recruit_companion("wizard")
+    wizard = game.companions[0]
+    assert (wizard.name_cf, wizard.name_tokens) == ("old wizard", ("old", "wizard"))
+    assert game.companions.find("OLD WIZ") is wizard
+
+    game.process_command("dismiss WIZARD")
+    assert game.companions == []
+    assert game.get_monsters_in_room(1) == [game.monsters[2]]
+    assert "Old Wizard has left your party." in capsys.readouterr().out
+
+
+def test_questions_dispatch_on_first_keyword(game, capsys):
+    question = game._action_table["question"]
+    question({"action": "question", "text": "Who is here?"})
+    assert capsys.readouterr().out == "You see:\n  - Old Wizard\n"
+    question({"action": "question", "text": "what am I carrying"})
+    assert capsys.readouterr().out == "\nYou are empty-handed.\n"
+    question({"action": "question", "text": "Is this the whole story?"})
+    assert capsys.readouterr().out == "I'm not sure how to answer that.\n"
+
+
+def test_run_reads_piped_commands_until_quit(game, monkeypatch, capsys):
+    import io
+    import sys
+
+    monkeypatch.setattr(sys, "stdin", io.StringIO("\nnorth\nquit\nlook\n"))
+    game.run()
+    assert game.game_over
+    assert game.player.current_room == 2
+    assert sys.stdin.readline() == "look\n"  # stopped reading at quit
+
+    monkeypatch.setattr(sys, "stdin", io.StringIO("north"))
+    game.game_over = False
+    game.run()  # reloads, then ends quietly at end of input
+    assert not game.game_over
+    assert game.player.current_room == 2
@@ -0,0 +1,64 @@
+"""Tests for the plugin event bus"""
+
+from src.acs.core.event_bus import EventBus, EventPriority
+
+
+def _handler(name, calls):
+    def handle(event):
+        calls.append(name)
+
+    handle.__name__ = name
+    return handle
+
+
+def _order(subscriptions):
+    return [
+        (sub.handler.__name__, sub.priority, sub.plugin_name) for sub in subscriptions
+    ]
+
+
+def test_subscribe_many_orders_handlers_like_repeated_subscribe():
+    calls = []
+    subscriptions = [
+        ("game.move", _handler("low", calls), EventPriority.LOW, "a"),
+        ("*", _handler("any_normal", calls), EventPriority.NORMAL, "a"),
+        ("game.move", _handler("high", calls), EventPriority.HIGH, "b"),
+        ("game.move", _handler("normal1", calls), EventPriority.NORMAL, "b"),
+        ("*", _handler("any_critical", calls), EventPriority.CRITICAL, "b"),
+        ("game.move", _handler("normal2", calls), EventPriority.NORMAL, "c"),
+        ("*", _handler("any_normal2", calls), EventPriority.NORMAL, "c"),
+        ("game.look", _handler("look", calls), EventPriority.HIGH, "c"),
+    ]
+    # Handlers already on the bus keep their place among equal priorities
+    existing = [
+        ("game.move", _handler("early", calls), EventPriority.NORMAL, "x"),
+        ("*", _handler("any_early", calls), EventPriority.NORMAL, "x"),
+    ]
+
+    one_by_one = EventBus()
+    for subscription in existing + subscriptions:
+        one_by_one.subscribe(*subscription)
+
+    batched = EventBus()
+    for subscription in existing:
+        batched.subscribe(*subscription)
+    batched.subscribe_many(subscriptions)
+
+    assert batched._subscriptions.keys() == one_by_one._subscriptions.keys()
+    for event_name, expected in one_by_one._subscriptions.items():
+        assert _order(batched._subscriptions[event_name]) == _order(expected)
+    assert _order(batched._wildcard_subscriptions) == _order(
+        one_by_one._wildcard_subscriptions
+    )
+    assert _order(batched._wildcard_subscriptions) == [
+        ("any_critical", EventPriority.CRITICAL, "b"),
+        ("any_early", EventPriority.NORMAL, "x"),
+        ("any_normal", EventPriority.NORMAL, "a"),
+        ("any_normal2", EventPriority.NORMAL, "c"),
+    ]
+
+    batched.publish("game.move")
+    batched_calls = calls[:]
+    calls.clear()
+    one_by_one.publish("game.move")
+    assert batched_calls == calls
@@ -0,0 +1,399 @@
+"""Tests for the modding and scripting system"""
+
+from src.acs.tools.modding import (
+    CustomCommand,
+    EventType,
+    ModdingSystem,
+    ScriptHook,
+)
+
+
+def test_hook_script_is_precompiled_on_register():
+    mod_sys = ModdingSystem()
+    hook = ScriptHook(event=EventType.ON_ENTER_ROOM, script_code='echo("hi")')
+    mod_sys.register_hook(hook)
+
+    assert hook._compiled is not None
+    assert mod_sys.trigger_event(EventType.ON_ENTER_ROOM, {}) == ["hi"]
+    assert mod_sys.trigger_event(EventType.ON_ENTER_ROOM, {}) == ["hi"]
+
+
+def test_syntax_error_reported_at_trigger():
+    mod_sys = ModdingSystem()
+    mod_sys.register_hook(
+        ScriptHook(event=EventType.ON_EXAMINE, script_code="echo(")
+    )
+
+    output = mod_sys.trigger_event(EventType.ON_EXAMINE, {})
+    assert len(output) == 1
+    assert output[0].startswith("[Script Error:")
+
+
+def test_custom_command_uses_compiled_handler():
+    mod_sys = ModdingSystem()
+    mod_sys.register_command(
+        CustomCommand(
+            verb="dance",
+            aliases=["boogie"],
+            handler_code='echo("You dance " + data["args"])',
+        )
+    )
+
+    assert mod_sys.execute_custom_command("boogie", "wildly") == [
+        "You dance wildly"
+    ]
+    assert mod_sys.execute_custom_command("BOOGIE", "") == ["You dance "]
+    assert mod_sys.execute_custom_command("sing", "") is None
+
+
+def test_script_namespace_is_isolated_between_triggers():
+    mod_sys = ModdingSystem()
+    mod_sys.register_hook(
+        ScriptHook(
+            event=EventType.ON_COMMAND,
+            script_code=(
+                "echo(str('leaked' in globals()))\n"
+                "leaked = True\n"
+                "echo(str(math.sqrt(data['n'])))"
+            ),
+        )
+    )
+
+    assert mod_sys.trigger_event(EventType.ON_COMMAND, {"n": 9}) == [
+        "False",
+        "3.0",
+    ]
+    assert mod_sys.trigger_event(EventType.ON_COMMAND, {"n": 16}) == [
+        "False",
+        "4.0",
+    ]
+
+
+def test_hooks_run_in_priority_order():
+    mod_sys = ModdingSystem()
+    for name, priority in [("low", 0), ("high", 10), ("mid", 5), ("low2", 0)]:
+        mod_sys.register_hook(
+            ScriptHook(
+                event=EventType.ON_TAKE_ITEM,
+                script_code=f'echo("{name}")',
+                priority=priority,
+            )
+        )
+
+    assert mod_sys.trigger_event(EventType.ON_TAKE_ITEM, {}) == [
+        "high",
+        "mid",
+        "low",
+        "low2",
+    ]
+
+
+def test_filtered_hooks_only_run_for_matching_events():
+    mod_sys = ModdingSystem()
+    mod_sys.register_hook(
+        ScriptHook(
+            event=EventType.ON_ENTER_ROOM,
+            script_code='echo("room 5")',
+            filter_params={"room_id": 5},
+        )
+    )
+    mod_sys.register_hook(
+        ScriptHook(
+            event=EventType.ON_ENTER_ROOM,
+            script_code='echo("room 5 or 6")',
+            priority=1,
+            filter_params={"room_id": [5, 6]},
+        )
+    )
+    mod_sys.register_hook(
+        ScriptHook(event=EventType.ON_ENTER_ROOM, script_code='echo("any")')
+    )
+
+    assert mod_sys.trigger_event(EventType.ON_ENTER_ROOM, {"room_id": 5}) == [
+        "room 5 or 6",
+        "room 5",
+        "any",
+    ]
+    assert mod_sys.trigger_event(EventType.ON_ENTER_ROOM, {"room_id": 6}) == [
+        "room 5 or 6",
+        "any",
+    ]
+    assert mod_sys.trigger_event(EventType.ON_ENTER_ROOM, {}) == ["any"]
+
+
+def test_custom_command_help_lists_each_command_once():
+    mod_sys = ModdingSystem()
+    mod_sys.register_command(
+        CustomCommand(
+            verb="dance",
+            aliases=["boogie", "jig"],
+            handler_code="pass",
+            help_text="Dance around",
+        )
+    )
+    mod_sys.register_command(
+        CustomCommand(verb="xyzzy", aliases=[], handler_code="pass", hidden=True)
+    )
+    mod_sys.register_command(CustomCommand(verb="sing", aliases=[], handler_code="pass"))
+
+    assert mod_sys.get_custom_command_help() == [
+        "  dance (boogie, jig) - Dance around",
+        "  sing - Custom command",
+    ]
+
+
+def test_multi_key_scalar_filter():
+    mod_sys = ModdingSystem()
+    mod_sys.register_hook(
+        ScriptHook(
+            event=EventType.ON_USE_ITEM,
+            script_code='echo("lamp in cave")',
+            filter_params={"item": "lamp", "room_id": 3},
+        )
+    )
+
+    for _ in range(2):
+        assert mod_sys.trigger_event(
+            EventType.ON_USE_ITEM, {"item": "lamp", "room_id": 3}
+        ) == ["lamp in cave"]
+    assert mod_sys.trigger_event(
+        EventType.ON_USE_ITEM, {"item": "lamp", "room_id": 4}
+    ) == []
+    assert mod_sys.trigger_event(EventType.ON_USE_ITEM, {"item": "lamp"}) == []
+    assert mod_sys.trigger_event(
+        EventType.ON_USE_ITEM, {"item": ["lamp"], "room_id": 3}
+    ) == []
+
+
+class _Named:
+    def __init__(self, name):
+        self.name = name
+
+
+class _FakeRoom:
+    def __init__(self, npcs=(), items=()):
+        self.npcs = list(npcs)
+        self.items = list(items)
+
+
+class _FakePlayer:
+    def __init__(self, inventory=()):
+        self.inventory = list(inventory)
+
+
+class _FakeEngine:
+    def __init__(self, room, player):
+        self.current_room = room
+        self.player = player
+        self.rooms = {}
+
+
+def test_context_name_lookups_follow_room_changes():
+    from src.acs.tools.modding import ScriptContext
+
+    guard = _Named("Guard")
+    sword = _Named("Sword")
+    hall = _FakeRoom(npcs=[guard], items=[sword])
+    engine = _FakeEngine(hall, _FakePlayer())
+    ctx = ScriptContext(engine)
+
+    assert ctx.get_npc("guard") is guard
+    assert ctx.get_npc("GUARD") is guard
+    assert ctx.get_item("sword") is sword
+
+    # Picking the sword up changes the room contents
+    hall.items.remove(sword)
+    engine.player.inventory.append(sword)
+    assert ctx.get_item("sword") is sword
+
+    engine.current_room = _FakeRoom()
+    assert ctx.get_npc("guard") is None
+    assert ctx.get_item("lamp") is None
+
+
+def test_context_lookups_drop_swapped_or_renamed_objects():
+    from src.acs.tools.modding import ScriptContext
+
+    coin, gem, guard, thief = (_Named(n) for n in ("Coin", "Gem", "Guard", "Thief"))
+    hall = _FakeRoom(npcs=[guard], items=[coin])
+    ctx = ScriptContext(_FakeEngine(hall, _FakePlayer()))
+    assert ctx.get_item("coin") is coin
+    assert ctx.get_npc("guard") is guard
+
+    # Same counts, different contents
+    hall.items.remove(coin)
+    hall.items.append(gem)
+    hall.npcs[0] = thief
+    assert ctx.get_item("coin") is None
+    assert ctx.get_npc("guard") is None
+
+    gem.name = "Coin"
+    assert ctx.get_item("coin") is gem
+    gem.name = "Gem"
+    assert ctx.get_item("coin") is None
+
+
+def test_context_item_lookup_prefers_inventory_after_changes():
+    from src.acs.tools.modding import ScriptContext
+
+    room_torch, own_torch, rope = _Named("Torch"), _Named("Torch"), _Named("Rope")
+    hall = _FakeRoom(items=[room_torch])
+    player = _FakePlayer(inventory=[rope])
+    ctx = ScriptContext(_FakeEngine(hall, player))
+    assert ctx.get_item("torch") is room_torch
+
+    player.inventory[0] = own_torch
+    assert ctx.get_item("torch") is own_torch
+
+
+def test_scripts_run_as_persistent_functions():
+    mod_sys = ModdingSystem()
+    hook = ScriptHook(
+        event=EventType.ON_ATTACK,
+        script_code="""
+def double(n):
+    return n * 2
+
+echo(str(double(data["damage"])))
+""",
+    )
+    mod_sys.register_hook(hook)
+
+    assert hook._callable is not None
+    assert mod_sys.trigger_event(EventType.ON_ATTACK, {"damage": 4}) == ["8"]
+
+
+def test_multiline_string_scripts_fall_back_to_exec():
+    mod_sys = ModdingSystem()
+    hook = ScriptHook(
+        event=EventType.ON_TALK,
+        script_code='echo("""line one\nline two""")',
+    )
+    mod_sys.register_hook(hook)
+
+    assert hook._callable is None
+    assert mod_sys.trigger_event(EventType.ON_TALK, {}) == ["line one\nline two"]
+
+
+def test_failed_script_output_is_replaced_by_error():
+    mod_sys = ModdingSystem()
+    mod_sys.register_hook(
+        ScriptHook(
+            event=EventType.ON_KILL,
+            script_code='echo("before")\nraise ValueError("boom")',
+            priority=1,
+        )
+    )
+    mod_sys.register_hook(ScriptHook(event=EventType.ON_KILL, script_code='echo("ok")'))
+
+    assert mod_sys.trigger_event(EventType.ON_KILL, {}) == [
+        "[Script Error: boom]",
+        "ok",
+    ]
+    assert mod_sys.script_context.output_buffer == []
+
+
+def test_matches_filter_with_compiled_checks():
+    hook = ScriptHook(
+        event=EventType.ON_TALK,
+        script_code="pass",
+        filter_params={"npc": ["wizard", "witch"], "mood": "happy"},
+    )
+
+    assert hook.matches_filter({"npc": "witch", "mood": "happy"})
+    assert not hook.matches_filter({"npc": "witch", "mood": "sad"})
+    assert not hook.matches_filter({"npc": "troll", "mood": "happy"})
+    assert not hook.matches_filter({"mood": "happy"})
+    assert not hook.matches_filter({"npc": ["witch"], "mood": "happy"})
+    assert ScriptHook(event=EventType.ON_TALK, script_code="pass").matches_filter({})
+
+
+def test_script_flags_live_on_engine():
+    engine = _FakeEngine(_FakeRoom(), _FakePlayer())
+    mod_sys = ModdingSystem(engine)
+    assert engine.script_flags == {}
+
+    mod_sys.register_hook(
+        ScriptHook(
+            event=EventType.ON_SAVE,
+            script_code='set_flag("saved")\necho(str(has_flag("saved")))',
+        )
+    )
+    assert mod_sys.trigger_event(EventType.ON_SAVE, {}) == ["True"]
+    assert mod_sys.script_context.get_flag("saved") is True
+    assert mod_sys.script_context.get_flag("missing", 3) == 3
+
+
+def test_trigger_event_accepts_event_value_strings():
+    mod_sys = ModdingSystem()
+    hook = ScriptHook(event=EventType.ON_LOAD, script_code='echo("loaded")')
+    mod_sys.register_hook(hook)
+
+    assert mod_sys.trigger_event("on_load", {}) == ["loaded"]
+    assert mod_sys.trigger_event(EventType.ON_LOAD, {}) == ["loaded"]
+
+    state = mod_sys.to_dict()
+    assert state["enabled_hooks"] == [{"event": "on_load", "enabled": True}]
+    mod_sys.from_dict({"enabled_hooks": [{"event": "on_load", "enabled": False}]})
+    assert hook.enabled is False
+    assert mod_sys.trigger_event("on_load", {}) == []
+
+
+DECLARATIVE_MOD = """
+# example_mod.py
+hook = ScriptHook(
+    event=EventType.ON_ENTER_ROOM,
+    script_code='echo("A strange presence...")',
+    filter_params={'room_id': 5},
+)
+register_hook(hook)
+
+register_command(CustomCommand(
+    verb="dance",
+    aliases=["boogie"],
+    handler_code='echo("You dance.")',
+))
+"""
+
+DYNAMIC_MOD = """
+for room_id in (1, 2):
+    register_hook(ScriptHook(
+        event=EventType.ON_ENTER_ROOM,
+        script_code=f'echo("room {room_id}")',
+        filter_params={'room_id': room_id},
+    ))
+"""
+
+
+def test_load_declarative_mod_file(tmp_path):
+    from src.acs.tools import modding
+
+    mod_file = tmp_path / "example_mod.py"
+    mod_file.write_text(DECLARATIVE_MOD)
+    tree = modding.ast.parse(DECLARATIVE_MOD)
+    assert modding._read_declarative_mod(tree) is not None
+
+    mod_sys = ModdingSystem()
+    assert mod_sys.load_mod_file(str(mod_file))
+    assert mod_sys.trigger_event(EventType.ON_ENTER_ROOM, {"room_id": 5}) == [
+        "A strange presence..."
+    ]
+    assert mod_sys.execute_custom_command("boogie", "") == ["You dance."]
+
+
+def test_load_dynamic_mod_file_falls_back_to_exec(tmp_path):
+    from src.acs.tools import modding
+
+    mod_file = tmp_path / "loop_mod.py"
+    mod_file.write_text(DYNAMIC_MOD)
+    assert modding._read_declarative_mod(modding.ast.parse(DYNAMIC_MOD)) is None
+
+    mod_sys = ModdingSystem()
+    assert mod_sys.load_mod_file(str(mod_file))
+    assert mod_sys.trigger_event(EventType.ON_ENTER_ROOM, {"room_id": 2}) == [
+        "room 2"
+    ]
+
+
+def test_load_missing_mod_file_fails(tmp_path):
+    assert not ModdingSystem().load_mod_file(str(tmp_path / "missing.py"))